@@ -0,0 +1,20 @@
+#!/bin/bash
+
+# Stand-in for deploy.sh used by benchmarks/throughput.py
+# Sleeps instead of reinstalling / restarting so the webhook listener's
+# deployment path can be exercised without touching a real service
+
+case "$1" in
+    update)
+        sleep "${FAKE_DEPLOY_UPDATE_SECONDS:-2}"
+        ;;
+    restart)
+        sleep "${FAKE_DEPLOY_RESTART_SECONDS:-0.5}"
+        ;;
+    *)
+        echo "Usage: $0 {update|restart}" >&2
+        exit 1
+        ;;
+esac
+
+echo "fake deploy.sh $1 finished"
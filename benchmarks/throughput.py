@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+End-to-end throughput benchmark for the non-page hot paths
+Replays signed GitHub push payloads against the webhook listener and contact
+form submissions through send_contact_form_email, with local fakes standing in
+for the Gmail API, the site's control endpoint and deploy.sh. Request latency,
+queueing, event loop stalls and memory are written out as JSON.
+
+Usage:
+    uv run --extra bench python benchmarks/throughput.py --output benchmark-results.json
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import itertools
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator, cast
+
+import httpx
+from loguru import logger
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+SRC_DIR = REPO_ROOT / 'src'
+sys.path.insert(0, str(SRC_DIR))
+
+from mti_common.loop_watchdog import LoopWatchdog
+
+FAKE_DEPLOY_SCRIPT = BENCH_DIR / 'fake_deploy.sh'
+WEBHOOK_SECRET = 'benchmark-secret'
+
+# A file that triggers each deployment plan; replayed pushes cycle through
+# the selected plans
+PLAN_FILES = {
+    'content': 'src/mti_sites_sethstenzel_me/content/pages/index.json',
+    'static': 'src/mti_sites_sethstenzel_me/static/css/styles.css',
+    'code': 'src/mti_sites_sethstenzel_me/site.py',
+    'dependencies': 'pyproject.toml',
+}
+
+
+class FakeUpstreamServer(ThreadingHTTPServer):
+    """Serves FakeUpstreamHandler on a free local port."""
+
+    daemon_threads = True
+    gmail_latency: float  # seconds each fake Gmail send takes
+    ids: itertools.count  # fake message ids and content versions
+
+    def __init__(self, gmail_latency: float):
+        super().__init__(('127.0.0.1', 0), FakeUpstreamHandler)
+        self.gmail_latency = gmail_latency
+        self.ids = itertools.count(1)
+
+
+class FakeUpstreamHandler(BaseHTTPRequestHandler):
+    """Fake Gmail API `messages.send` and site `/_control/reload-content`."""
+
+    def do_POST(self):
+        server = cast(FakeUpstreamServer, self.server)
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        path = self.path.split('?')[0]
+        if path.endswith('/messages/send'):
+            time.sleep(server.gmail_latency)
+            message_id = f'fake-{next(server.ids)}'
+            body = {'id': message_id, 'threadId': message_id, 'labelIds': ['SENT']}
+        elif path == '/_control/reload-content':
+            body = {'changed': ['index'], 'version': next(server.ids)}
+        else:
+            self.send_error(404)
+            return
+
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def fake_upstream(gmail_latency: float) -> Iterator[str]:
+    """Run the fake upstream server in a thread, yielding its base URL."""
+    server = FakeUpstreamServer(gmail_latency)
+    thread = threading.Thread(target=server.serve_forever, name='fake-upstream', daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def process_memory(pid: int) -> dict:
+    """Current and peak resident set size of a process in KiB (Linux only)."""
+    try:
+        status = Path(f'/proc/{pid}/status').read_text()
+    except OSError:
+        return {}
+    fields = dict(line.split(':', 1) for line in status.splitlines() if ':' in line)
+    memory = {}
+    for key, name in (('VmRSS', 'rss_kb'), ('VmHWM', 'peak_rss_kb')):
+        if key in fields:
+            memory[name] = int(fields[key].split()[0])
+    return memory
+
+
+def summarize(seconds: list[float]) -> dict:
+    """Mean, percentiles and max of a list of durations, in milliseconds."""
+    if not seconds:
+        return {}
+    ordered = sorted(seconds)
+
+    def percentile(q: float) -> float:
+        return ordered[min(len(ordered) - 1, round(q * (len(ordered) - 1)))]
+
+    return {
+        'mean': round(sum(ordered) / len(ordered) * 1000, 3),
+        'p50': round(percentile(0.5) * 1000, 3),
+        'p90': round(percentile(0.9) * 1000, 3),
+        'p99': round(percentile(0.99) * 1000, 3),
+        'max': round(ordered[-1] * 1000, 3),
+    }
+
+
+async def replay(send: Callable[[int], Awaitable[bool]], count: int, rate: float | None) -> dict:
+    """
+    Fire `count` requests at `rate` per second, or all at once if rate is None.
+
+    Latency is measured from when each request was scheduled, so time spent
+    waiting behind earlier requests (or a blocked event loop) is included.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    async def one(i: int) -> tuple[bool, float, float]:
+        scheduled = started + (i / rate if rate else 0.0)
+        await asyncio.sleep(max(0.0, scheduled - loop.time()))
+        begun = loop.time()
+        try:
+            ok = await send(i)
+        except Exception as e:
+            logger.warning(f"Request {i} failed: {e}")
+            ok = False
+        return ok, begun - scheduled, loop.time() - scheduled
+
+    results = await asyncio.gather(*(one(i) for i in range(count)))
+    wall = loop.time() - started
+    latencies = [latency for _, _, latency in results]
+    fastest = min(latencies, default=0.0)
+    return {
+        'requests': count,
+        'rate_per_second': rate,
+        'errors': sum(1 for ok, _, _ in results if not ok),
+        'wall_seconds': round(wall, 3),
+        'throughput_per_second': round(count / wall, 3) if wall else None,
+        'latency_ms': summarize(latencies),
+        # How late the request could even be sent - non-zero when the loop was blocked
+        'start_delay_ms': summarize([delay for _, delay, _ in results]),
+        # Latency above the fastest request, i.e. time spent queued behind others
+        'queueing_ms': summarize([latency - fastest for latency in latencies]),
+    }
+
+
+def run_git(*args: str, cwd: Path) -> None:
+    subprocess.run(
+        ['git', '-c', 'user.name=benchmark', '-c', 'user.email=benchmark@localhost', *args],
+        cwd=cwd, check=True, capture_output=True
+    )
+
+
+def make_deploy_checkout(workdir: Path) -> Path:
+    """A checkout with a local origin, so the listener's `git pull --ff-only` succeeds."""
+    origin = workdir / 'origin.git'
+    checkout = workdir / 'checkout'
+    run_git('init', '--bare', '-q', str(origin), cwd=workdir)
+    run_git('clone', '-q', str(origin), str(checkout), cwd=workdir)
+    run_git('commit', '-q', '--allow-empty', '-m', 'benchmark', cwd=checkout)
+    run_git('push', '-q', '-u', 'origin', 'HEAD', cwd=checkout)
+    return checkout
+
+
+def push_payload(i: int, plans: list[str]) -> bytes:
+    """A GitHub push event to the release branch touching one file of the i-th plan."""
+    payload = {
+        'ref': 'refs/heads/release',
+        'repository': {'full_name': 'benchmark/sethstenzel.me'},
+        'pusher': {'name': 'benchmark'},
+        'commits': [{
+            'id': f'{i:040x}',
+            'added': [],
+            'modified': [PLAN_FILES[plans[i % len(plans)]]],
+            'removed': [],
+        }],
+    }
+    return json.dumps(payload).encode()
+
+
+def sign(body: bytes) -> str:
+    return 'sha256=' + hmac.new(WEBHOOK_SECRET.encode(), msg=body, digestmod=hashlib.sha256).hexdigest()
+
+
+@contextmanager
+def webhook_listener(workdir: Path, checkout: Path, control_url: str, args: argparse.Namespace) -> Iterator[tuple[subprocess.Popen, str]]:
+    """Start a fresh webhook listener process wired to the fakes, yielding (process, base URL)."""
+    port = free_port()
+    env = {
+        **os.environ,
+        'PYTHONPATH': os.pathsep.join(filter(None, [str(SRC_DIR), os.environ.get('PYTHONPATH')])),
+        'WEBHOOK_SECRET': WEBHOOK_SECRET,
+        'WEBHOOK_PORT': str(port),
+        'ALLOWED_BRANCHES': 'release',
+        'DEPLOY_SCRIPT': str(FAKE_DEPLOY_SCRIPT),
+        'DEPLOY_DIR': str(checkout),
+        'SITE_CONTROL_URL': control_url,
+        'FAKE_DEPLOY_RESTART_SECONDS': str(args.restart_latency),
+        'FAKE_DEPLOY_UPDATE_SECONDS': str(args.update_latency),
+        'LOOP_WATCHDOG': '1',
+        'LOOP_WATCHDOG_INTERVAL_MS': str(args.lag_interval_ms),
+        'LOOP_WATCHDOG_THRESHOLD_MS': str(args.stall_threshold_ms),
+    }
+    env.pop('ENV_SNAPSHOT_DIR', None)
+
+    log_path = workdir / 'webhook_listener.out'
+    with open(log_path, 'a') as log:
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'uvicorn', 'web_hook_listener.webhook_listener:app',
+             '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning'],
+            cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT
+        )
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"Webhook listener exited early:\n{log_path.read_text()[-2000:]}")
+            try:
+                if httpx.get(f'{base_url}/health').status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError("Webhook listener did not become healthy within 30s")
+            time.sleep(0.1)
+        yield process, base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def bench_webhook_phase(base_url: str, process: subprocess.Popen, count: int, rate: float | None, plans: list[str]) -> dict:
+    async with httpx.AsyncClient(base_url=base_url, timeout=None) as client:
+        memory_before = process_memory(process.pid)
+
+        async def send(i: int) -> bool:
+            body = push_payload(i, plans)
+            response = await client.post('/webhook', content=body, headers={
+                'Content-Type': 'application/json',
+                'X-GitHub-Event': 'push',
+                'X-Hub-Signature-256': sign(body),
+            })
+            return response.status_code == 200
+
+        result = await replay(send, count, rate)
+        result['loop_lag'] = (await client.get('/loop-lag')).json()
+        result['memory'] = {'before': memory_before, 'after': process_memory(process.pid)}
+        return result
+
+
+def bench_webhook(workdir: Path, control_url: str, args: argparse.Namespace) -> dict:
+    """Replay pushes against the webhook listener, a fresh process per phase."""
+    checkout = make_deploy_checkout(workdir)
+    results: dict[str, Any] = {'plans': args.plans}
+    for phase, count, rate in (('steady', args.requests, args.rate), ('burst', args.burst, None)):
+        logger.info(f"webhook/{phase}: {count} pushes at {f'{rate:g}/s' if rate else 'once'}")
+        with webhook_listener(workdir, checkout, control_url, args) as (process, base_url):
+            results[phase] = asyncio.run(bench_webhook_phase(base_url, process, count, rate, args.plans))
+    return results
+
+
+def configure_fake_gmail(workdir: Path, endpoint: str) -> None:
+    """Point the Gmail helpers at the fake server with a token that never needs refreshing."""
+    credentials = workdir / 'credentials.json'
+    token = workdir / 'token.json'
+    credentials.write_text('{}')
+    token.write_text(json.dumps({
+        'token': 'benchmark',
+        'refresh_token': 'benchmark',
+        'client_id': 'benchmark',
+        'client_secret': 'benchmark',
+        'scopes': ['https://www.googleapis.com/auth/gmail.send'],
+        'expiry': '2099-01-01T00:00:00Z',
+    }))
+    os.environ['GMAIL_CREDENTIALS_FILE'] = str(credentials)
+    os.environ['GMAIL_TOKEN_FILE'] = str(token)
+    os.environ['GMAIL_API_ENDPOINT'] = f'{endpoint}/'
+
+
+async def bench_contact_phase(count: int, rate: float | None, args: argparse.Namespace) -> dict:
+    from mti_sites_sethstenzel_me.utils import send_contact_form_email
+
+    watchdog = LoopWatchdog('contact-benchmark', threshold=args.stall_threshold_ms / 1000, interval=args.lag_interval_ms / 1000)
+    watchdog.start()
+    memory_before = process_memory(os.getpid())
+
+    async def send(i: int) -> bool:
+        # Called straight on the event loop, the same way the contact page's
+        # submit handler calls it
+        success, _ = send_contact_form_email(
+            name=f'Benchmark {i}',
+            email=f'benchmark{i}@example.com',
+            message='Throughput benchmark submission.\nSecond line.',
+            recipient_email='inbox@example.com'
+        )
+        return success
+
+    result = await replay(send, count, rate)
+    # Let the heartbeat record the last stall before reading the histogram
+    await asyncio.sleep(watchdog.interval * 2)
+    watchdog.stop()
+    result['loop_lag'] = watchdog.snapshot()
+    result['memory'] = {'before': memory_before, 'after': process_memory(os.getpid())}
+    return result
+
+
+def bench_contact(workdir: Path, gmail_url: str, args: argparse.Namespace) -> dict:
+    """Send contact submissions through send_contact_form_email to the fake Gmail API."""
+    configure_fake_gmail(workdir, gmail_url)
+    from mti_sites_sethstenzel_me import utils
+    if not utils.GMAIL_API_AVAILABLE:
+        return {'skipped': 'Gmail API libraries not installed'}
+
+    # The first submission pays for importing the Gmail API stack; time it separately
+    started = time.perf_counter()
+    success, message = utils.send_contact_form_email('Warm up', 'warmup@example.com', 'Warm up', 'inbox@example.com')
+    if not success:
+        return {'skipped': f'Warm-up submission failed: {message}'}
+    results: dict[str, Any] = {'first_submission_ms': round((time.perf_counter() - started) * 1000, 3)}
+
+    for phase, count, rate in (('steady', args.requests, args.rate), ('burst', args.burst, None)):
+        logger.info(f"contact/{phase}: {count} submissions at {f'{rate:g}/s' if rate else 'once'}")
+        results[phase] = asyncio.run(bench_contact_phase(count, rate, args))
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the webhook and contact form paths against local fakes')
+    parser.add_argument('--scenario', choices=['all', 'webhook', 'contact'], default='all')
+    parser.add_argument('--requests', type=int, default=20, help='Requests in the steady phase (default: 20)')
+    parser.add_argument('--rate', type=float, default=2.0, help='Steady phase requests per second (default: 2)')
+    parser.add_argument('--burst', type=int, default=10, help='Requests fired at once in the burst phase (default: 10)')
+    parser.add_argument('--plans', default='content,static,code',
+                        help=f"Deployment plans the pushes cycle through, from {', '.join(PLAN_FILES)} (default: content,static,code)")
+    parser.add_argument('--restart-latency', type=float, default=0.5, help='Seconds fake `deploy.sh restart` takes (default: 0.5)')
+    parser.add_argument('--update-latency', type=float, default=2.0, help='Seconds fake `deploy.sh update` takes (default: 2)')
+    parser.add_argument('--gmail-latency', type=float, default=0.2, help='Seconds the fake Gmail API takes to send (default: 0.2)')
+    parser.add_argument('--lag-interval-ms', type=float, default=20, help='Event loop heartbeat interval (default: 20)')
+    parser.add_argument('--stall-threshold-ms', type=float, default=250, help='Lag counted as a stall (default: 250)')
+    parser.add_argument('--output', default='benchmark-results.json', help="Results file, or - for stdout")
+    args = parser.parse_args()
+
+    args.plans = [plan.strip() for plan in args.plans.split(',') if plan.strip()]
+    unknown = [plan for plan in args.plans if plan not in PLAN_FILES]
+    if unknown or not args.plans:
+        parser.error(f"Unknown plan(s): {', '.join(unknown) or '(none given)'}")
+
+    logger.remove()
+    # Progress from the harness, only warnings (e.g. loop stalls) from the code under test
+    logger.add(
+        sys.stderr,
+        format="{time:HH:mm:ss} | {level: <8} | {message}",
+        filter=lambda record: record['name'] == __name__ or record['level'].no >= logger.level('WARNING').no
+    )
+
+    results = {
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {key: value for key, value in vars(args).items() if key != 'output'},
+    }
+    with tempfile.TemporaryDirectory(prefix='site-benchmark-') as tmp, fake_upstream(args.gmail_latency) as upstream_url:
+        workdir = Path(tmp)
+        if args.scenario in ('all', 'webhook'):
+            results['webhook'] = bench_webhook(workdir, f'{upstream_url}/_control', args)
+        if args.scenario in ('all', 'contact'):
+            results['contact'] = bench_contact(workdir, upstream_url, args)
+
+    output = json.dumps(results, indent=2)
+    if args.output == '-':
+        print(output)
+    else:
+        Path(args.output).write_text(output + '\n')
+        logger.info(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
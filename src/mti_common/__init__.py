@@ -0,0 +1,3 @@
+# Helpers shared by the site and the webhook listener. Nothing in here may
+# import either of them, so the deploy service never depends on the site it
+# deploys.
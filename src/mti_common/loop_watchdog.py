@@ -0,0 +1,142 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from loguru import logger
+
+# Upper bounds (ms) of the lag histogram buckets; anything slower lands in +Inf
+LAG_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+class LoopWatchdog:
+    """
+    Measures asyncio event loop lag and reports what is blocking the loop.
+
+    A heartbeat task on the loop sleeps for `interval` seconds and records how
+    late it wakes up into a histogram. A separate monitor thread notices when
+    the heartbeat stops arriving, and once the loop has been stuck for longer
+    than `threshold` it logs the loop thread's current stack - i.e. the call
+    that is blocking it - once per stall.
+    """
+
+    def __init__(self, name: str, threshold: float = 0.25, interval: float = 0.1):
+        self.name = name
+        self.threshold = threshold
+        self.interval = interval
+        self.bucket_counts = [0] * (len(LAG_BUCKETS_MS) + 1)
+        self.lag_count = 0
+        self.lag_sum = 0.0
+        self.lag_max = 0.0
+        self.stalls = 0
+        self._last_beat = time.perf_counter()
+        self._loop_thread_id: int | None = None
+        self._heartbeat: asyncio.Task | None = None
+        self._monitor: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    @classmethod
+    def from_env(cls, name: str) -> 'LoopWatchdog | None':
+        """Build a watchdog from LOOP_WATCHDOG* environment variables, or None if disabled."""
+        if os.environ.get('LOOP_WATCHDOG', '1').lower() in ('0', 'false', 'no', 'off'):
+            return None
+        return cls(
+            name,
+            threshold=float(os.environ.get('LOOP_WATCHDOG_THRESHOLD_MS', '250')) / 1000,
+            interval=float(os.environ.get('LOOP_WATCHDOG_INTERVAL_MS', '100')) / 1000
+        )
+
+    def start(self) -> None:
+        """Start watching the running event loop. Must be called from the loop's thread."""
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stopped.clear()
+        self._heartbeat = loop.create_task(self._beat())
+        self._monitor = threading.Thread(target=self._watch, name=f'{self.name}-loop-watchdog', daemon=True)
+        self._monitor.start()
+        logger.info(
+            f"Loop watchdog started for {self.name} "
+            f"(threshold {self.threshold * 1000:.0f} ms, interval {self.interval * 1000:.0f} ms)"
+        )
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._heartbeat:
+            self._heartbeat.cancel()
+
+    async def _beat(self) -> None:
+        while True:
+            before = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self._last_beat = now
+            self._record(max(0.0, now - before - self.interval))
+
+    def _record(self, lag: float) -> None:
+        self.bucket_counts[bisect_left(LAG_BUCKETS_MS, lag * 1000)] += 1
+        self.lag_count += 1
+        self.lag_sum += lag
+        self.lag_max = max(self.lag_max, lag)
+
+    def _watch(self) -> None:
+        stalled_since: float | None = None
+        while not self._stopped.wait(self.interval):
+            last_beat = self._last_beat
+            blocked_for = time.perf_counter() - last_beat - self.interval
+            if blocked_for < self.threshold:
+                if stalled_since is not None:
+                    stall = max(0.0, last_beat - stalled_since - self.interval)
+                    logger.warning(f"Event loop for {self.name} unblocked after {stall * 1000:.0f} ms")
+                stalled_since = None
+                continue
+            if stalled_since is not None:
+                continue
+
+            stalled_since = last_beat
+            self.stalls += 1
+            frame = sys._current_frames().get(self._loop_thread_id) if self._loop_thread_id is not None else None
+            stack = ''.join(traceback.format_stack(frame)) if frame else '  <loop thread stack unavailable>\n'
+            logger.warning(
+                f"Event loop for {self.name} blocked for {blocked_for * 1000:.0f} ms, "
+                f"currently running:\n{stack}"
+            )
+
+    def snapshot(self) -> dict:
+        """Histogram and counters as a JSON-friendly dict."""
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip([*LAG_BUCKETS_MS, '+Inf'], self.bucket_counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            'name': self.name,
+            'threshold_ms': self.threshold * 1000,
+            'interval_ms': self.interval * 1000,
+            'samples': self.lag_count,
+            'lag_sum_ms': round(self.lag_sum * 1000, 3),
+            'lag_max_ms': round(self.lag_max * 1000, 3),
+            'stalls': self.stalls,
+            'buckets_ms': buckets,
+        }
+
+    def prometheus(self) -> str:
+        """Histogram in Prometheus text exposition format."""
+        labels = f'service="{self.name}"'
+        lines = [
+            '# HELP event_loop_lag_seconds Delay between scheduled and actual event loop wakeups',
+            '# TYPE event_loop_lag_seconds histogram',
+        ]
+        cumulative = 0
+        for bound, count in zip([*LAG_BUCKETS_MS, None], self.bucket_counts):
+            cumulative += count
+            le = '+Inf' if bound is None else f'{bound / 1000:g}'
+            lines.append(f'event_loop_lag_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f'event_loop_lag_seconds_sum{{{labels}}} {self.lag_sum:.6f}')
+        lines.append(f'event_loop_lag_seconds_count{{{labels}}} {self.lag_count}')
+        lines.append('# HELP event_loop_stalls_total Times the loop was blocked past the threshold')
+        lines.append('# TYPE event_loop_stalls_total counter')
+        lines.append(f'event_loop_stalls_total{{{labels}}} {self.stalls}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,136 @@
+import asyncio
+import os
+import time
+from fastapi import Request
+from fastapi.responses import HTMLResponse, PlainTextResponse
+from loguru import logger
+from nicegui import app, background_tasks, ui, Client
+from mti_sites_sethstenzel_me.static_render import STATIC_PAGES, get_static_html
+
+# Every open tab holds a NiceGUI client (and its element tree) in memory, so
+# cap how many can exist and reclaim the ones nobody is looking at
+MAX_CLIENTS = int(os.environ.get('MAX_CLIENTS', '300'))
+CLIENT_IDLE_TIMEOUT = float(os.environ.get('CLIENT_IDLE_TIMEOUT', '1800'))  # visible but untouched
+CLIENT_HIDDEN_TIMEOUT = float(os.environ.get('CLIENT_HIDDEN_TIMEOUT', '300'))  # in a background tab
+CLIENT_REAP_INTERVAL = 30
+
+# Reports user activity and tab visibility to the server. Once the server has
+# reaped the client, the next interaction or return to the tab reloads it.
+ACTIVITY_SCRIPT = '''
+<script>
+(() => {
+    let lastReport = 0;
+    const report = (force) => {
+        const now = Date.now();
+        if (!force && now - lastReport < 30000) return;
+        lastReport = now;
+        if (window.did_handshake) emitEvent('site_activity', {hidden: document.hidden});
+    };
+    document.addEventListener('visibilitychange', () => {
+        if (window.siteClientReaped) { if (!document.hidden) location.reload(); }
+        else report(true);
+    });
+    for (const type of ['pointerdown', 'keydown', 'scroll', 'touchstart']) {
+        document.addEventListener(type, () => {
+            if (window.siteClientReaped) location.reload();
+            else report(false);
+        }, {passive: true});
+    }
+})();
+</script>
+'''
+
+REAP_SCRIPT = '''
+window.siteClientReaped = true;
+window.socket.disconnect();
+setTimeout(() => document.getElementById("popup").ariaHidden = true, 0);
+'''
+
+# client id -> (monotonic time of last activity, tab hidden)
+_client_activity: dict[str, tuple[float, bool]] = {}
+_admission_rejections = 0
+
+
+def live_client_count() -> int:
+    return len(Client.instances)
+
+
+def _mark_active(client: Client, hidden: bool = False) -> None:
+    _client_activity[client.id] = (time.monotonic(), hidden)
+
+
+def track_client(client: Client) -> None:
+    """Start tracking activity for a newly connected client (reconnects keep their entry)."""
+    if client.id in _client_activity:
+        return
+    _mark_active(client)
+    # Runs inside the client's context, so this subscribes to that client's events
+    ui.on('site_activity', lambda e: _mark_active(client, bool(isinstance(e.args, dict) and e.args.get('hidden'))))
+
+
+def forget_client(client: Client) -> None:
+    _client_activity.pop(client.id, None)
+
+
+async def reap_client(client: Client) -> None:
+    """Release an idle client; the browser rebuilds the page when the visitor returns."""
+    client.run_javascript(REAP_SCRIPT)
+    # The browser's disconnect normally gets the client deleted after the
+    # reconnect timeout; make sure it goes even if the script never ran
+    await asyncio.sleep(client.page.resolve_reconnect_timeout() + 2)
+    if not client.is_deleted and client.id in Client.instances:
+        client.delete()
+
+
+async def reap_idle_clients() -> None:
+    while True:
+        await asyncio.sleep(CLIENT_REAP_INTERVAL)
+        now = time.monotonic()
+        for client_id, (last_active, hidden) in list(_client_activity.items()):
+            client = Client.instances.get(client_id)
+            if client is None:
+                _client_activity.pop(client_id, None)
+                continue
+            timeout = CLIENT_HIDDEN_TIMEOUT if hidden else CLIENT_IDLE_TIMEOUT
+            if now - last_active < timeout:
+                continue
+            logger.debug(f"Reaping idle client {client_id} ({'hidden' if hidden else 'visible'}, {now - last_active:.0f}s idle)")
+            _client_activity.pop(client_id, None)
+            background_tasks.create(reap_client(client), name=f'reap client {client_id}')
+
+
+def start_reaper() -> None:
+    background_tasks.create(reap_idle_clients(), name='reap idle clients')
+    logger.info(
+        f"Client limits: max {MAX_CLIENTS} live clients, reaping after "
+        f"{CLIENT_IDLE_TIMEOUT:.0f}s idle / {CLIENT_HIDDEN_TIMEOUT:.0f}s hidden"
+    )
+
+
+@app.middleware('http')
+async def admission_control(request: Request, call_next):
+    """Serve a static fallback instead of a new NiceGUI client once the server is at capacity."""
+    global _admission_rejections
+    if request.method != 'GET' or live_client_count() < MAX_CLIENTS:
+        return await call_next(request)
+    path = request.url.path
+    if path not in Client.page_routes.values():
+        return await call_next(request)
+
+    _admission_rejections += 1
+    if _admission_rejections % 100 == 1:
+        logger.warning(f"At client capacity ({MAX_CLIENTS}), serving static fallback ({_admission_rejections} so far)")
+    if path in STATIC_PAGES:
+        html, _ = get_static_html(path)
+        return HTMLResponse(html, headers={'X-Admission': 'static-fallback', 'Cache-Control': 'no-store'})
+    return PlainTextResponse(
+        'The site is busy right now, please try again in a moment.',
+        status_code=503,
+        headers={'Retry-After': '30'}
+    )
+
+
+ui.add_head_html(ACTIVITY_SCRIPT, shared=True)
+app.on_connect(track_client)
+app.on_delete(forget_client)
+app.on_startup(start_reaper)
@@ -0,0 +1,131 @@
+import asyncio
+import os
+import weakref
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, TypeVar
+from loguru import logger
+from nicegui import app, background_tasks, ui, Client
+from mti_sites_sethstenzel_me.page_content import on_content_change, refresh_page_content
+
+# Seconds between checks of content/pages/ for edited files (0 disables the
+# watcher; /_control/reload-content still pushes changes)
+CONTENT_WATCH_INTERVAL = float(os.environ.get('CONTENT_WATCH_INTERVAL', '1'))
+
+ContentPath = tuple[str, ...]
+E = TypeVar('E', bound=ui.element)
+
+
+@dataclass
+class LiveBinding(Generic[E]):
+    element: weakref.ref[E]
+    path: ContentPath
+    render: Callable[[E, Any], object]
+
+    @property
+    def live_element(self) -> E | None:
+        element = self.element()
+        return None if element is None or element.is_deleted else element
+
+
+# client id -> page content name -> elements showing parts of that document
+_bindings: dict[str, dict[str, list[LiveBinding[Any]]]] = {}
+
+
+def live_content(element: E, page: str, path: str | ContentPath, render: Callable[[E, Any], object]) -> None:
+    """
+    Keep an element in sync with one value of a page content document.
+
+    When the value at `path` changes, `render(element, new_value)` is called
+    for every live copy of the element (new_value is None if it was removed).
+    Its return value is ignored, so setters like `label.set_text` can be used as is.
+    """
+    path = (path,) if isinstance(path, str) else tuple(path)
+    pages = _bindings.setdefault(element.client.id, {})
+    # Drop bindings left behind by content this client has navigated away from
+    bindings = [binding for binding in pages.get(page, []) if binding.live_element]
+    bindings.append(LiveBinding(weakref.ref(element), path, render))
+    pages[page] = bindings
+
+
+def forget_client(client: Client) -> None:
+    _bindings.pop(client.id, None)
+
+
+def changed_paths(old: Any, new: Any, prefix: ContentPath = ()) -> set[ContentPath]:
+    """Paths of the values that differ between two content documents."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        paths = set()
+        for key in old.keys() | new.keys():
+            if key not in old or key not in new:
+                paths.add((*prefix, key))
+            else:
+                paths |= changed_paths(old[key], new[key], (*prefix, key))
+        return paths
+    return set() if old == new else {prefix}
+
+
+def _lookup(document: Any, path: ContentPath) -> Any:
+    for key in path:
+        if not isinstance(document, dict) or key not in document:
+            return None
+        document = document[key]
+    return document
+
+
+def _covers(binding: LiveBinding, path: ContentPath) -> bool:
+    """True if the binding's element renders the value at `path` (or a value containing it)."""
+    return path[:len(binding.path)] == binding.path
+
+
+def push_content_change(name: str, old: Any, new: Any) -> None:
+    """
+    Patch the elements showing changed values on every live client.
+
+    Changes no bound element covers (e.g. a tile added or removed) can't be
+    patched in place, so only the clients showing that page are reloaded.
+    """
+    paths = changed_paths(old, new)
+    patched = reloaded = 0
+    for client_id, pages in list(_bindings.items()):
+        client = Client.instances.get(client_id)
+        if client is None:
+            _bindings.pop(client_id, None)
+            continue
+        bindings = [binding for binding in pages.get(name, []) if binding.live_element]
+        pages[name] = bindings
+        if not bindings:
+            continue
+
+        if not all(any(_covers(binding, path) for binding in bindings) for path in paths):
+            client.run_javascript('location.reload()')
+            reloaded += 1
+            continue
+        for binding in bindings:
+            element = binding.live_element
+            if element is not None and any(_covers(binding, path) for path in paths):
+                binding.render(element, _lookup(new, binding.path))
+                patched += 1
+
+    logger.info(
+        f"Pushed {name} content change ({len(paths)} value(s)): "
+        f"patched {patched} element(s), reloaded {reloaded} client(s)"
+    )
+
+
+async def watch_page_content() -> None:
+    while True:
+        await asyncio.sleep(CONTENT_WATCH_INTERVAL)
+        # Changed files reach push_content_change through on_content_change
+        refresh_page_content()
+
+
+def start_content_watcher() -> None:
+    if CONTENT_WATCH_INTERVAL <= 0:
+        return
+    background_tasks.create(watch_page_content(), name='watch page content')
+    logger.info(f"Watching page content for live updates every {CONTENT_WATCH_INTERVAL:g}s")
+
+
+on_content_change(push_content_change)
+app.on_delete(forget_client)
+app.on_startup(start_content_watcher)
@@ -0,0 +1,77 @@
+from fastapi import Request, HTTPException, status
+from fastapi.responses import PlainTextResponse, Response
+from loguru import logger
+from nicegui import app
+from mti_sites_sethstenzel_me.page_content import reload_page_content, content_version
+from mti_common.loop_watchdog import LoopWatchdog
+from mti_sites_sethstenzel_me import request_profiler
+
+# Local control endpoints used by the deployment tooling. nginx proxies from
+# localhost too, so forwarded requests are rejected even from 127.0.0.1.
+CONTROL_PREFIX = '/_control'
+LOOPBACK_HOSTS = {'127.0.0.1', '::1', 'localhost'}
+
+loop_watchdog = LoopWatchdog.from_env('sethstenzel-site')
+if loop_watchdog:
+    app.on_startup(loop_watchdog.start)
+    app.on_shutdown(loop_watchdog.stop)
+
+
+def is_local_request(request: Request) -> bool:
+    """True if the request came straight from this machine, not through the proxy."""
+    client_host = request.client.host if request.client else ''
+    if client_host not in LOOPBACK_HOSTS:
+        return False
+    return not (request.headers.get('x-forwarded-for') or request.headers.get('x-real-ip'))
+
+
+def require_local_request(request: Request) -> None:
+    if not is_local_request(request):
+        client_host = request.client.host if request.client else 'unknown'
+        logger.warning(f"Rejected non-local control request to {request.url.path} from {client_host}")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+
+@app.post(f'{CONTROL_PREFIX}/reload-content')
+async def reload_content(request: Request):
+    """Re-read the page content JSON so new page loads pick it up without a restart."""
+    require_local_request(request)
+    changed = reload_page_content()
+    return {'changed': changed, 'version': content_version()}
+
+
+@app.get(f'{CONTROL_PREFIX}/loop-lag')
+async def loop_lag(request: Request, format: str = 'json'):
+    """Event loop lag histogram as JSON, or Prometheus text with ?format=prometheus."""
+    require_local_request(request)
+    if not loop_watchdog:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Loop watchdog disabled")
+    if format == 'prometheus':
+        return PlainTextResponse(loop_watchdog.prometheus())
+    return loop_watchdog.snapshot()
+
+
+@app.get(f'{CONTROL_PREFIX}/profiles')
+async def list_profiles(request: Request):
+    """The slowest profiled page builds and handlers kept so far, slowest first."""
+    require_local_request(request)
+    return {'enabled': request_profiler.is_enabled(), 'profiles': request_profiler.worst_profiles()}
+
+
+@app.get(f'{CONTROL_PREFIX}/profiles/{{profile_id}}.pstats')
+async def download_profile(request: Request, profile_id: int):
+    """
+    Download a kept profile as a pstats file.
+
+    Open it with `python -m pstats`, snakeviz, or turn it into a flame graph
+    with flameprof / gprof2dot.
+    """
+    require_local_request(request)
+    stats = request_profiler.profile_stats(profile_id)
+    if stats is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return Response(
+        stats,
+        media_type='application/octet-stream',
+        headers={'Content-Disposition': f'attachment; filename="profile-{profile_id}.pstats"'}
+    )
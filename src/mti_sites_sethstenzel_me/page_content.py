@@ -0,0 +1,100 @@
+import json
+from pathlib import Path
+from typing import Any, Callable
+from loguru import logger
+
+CONTENT_PAGES_DIR = Path(__file__).parent / 'content' / 'pages'
+
+# Parsed page documents keyed by name (the JSON file stem, e.g. 'index')
+_page_content: dict[str, dict[str, Any]] = {}
+# File modification times the cached documents were read at
+_page_mtimes: dict[str, int | None] = {}
+_content_version = 0
+# Called with (name, old document, new document) whenever a reload changes a page
+_change_listeners: list[Callable[[str, dict[str, Any], dict[str, Any]], None]] = []
+
+
+def _content_path(name: str) -> Path:
+    return CONTENT_PAGES_DIR / f'{name}.json'
+
+
+def _file_mtime(name: str) -> int | None:
+    try:
+        return _content_path(name).stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _read_page_content(name: str) -> dict[str, Any] | None:
+    """Read and parse a page content file, returning None if it can't be loaded."""
+    json_path = _content_path(name)
+    try:
+        with open(json_path, 'r', encoding='utf-8') as json_file:
+            content = json.load(json_file)
+        if isinstance(content, dict):
+            return content
+        logger.error(f"Page content file {json_path} must contain a JSON object")
+    except FileNotFoundError:
+        logger.error(f"Page content file not found: {json_path}")
+    except json.JSONDecodeError as e:
+        logger.error(f"Invalid JSON in page content file {json_path}: {e}")
+    return None
+
+
+def get_page_content(name: str) -> dict[str, Any]:
+    """Return the parsed content document for a page, loading it on first use."""
+    if name not in _page_content:
+        _page_mtimes[name] = _file_mtime(name)
+        content = _read_page_content(name)
+        _page_content[name] = content if content is not None else {}
+    return _page_content[name]
+
+
+def reload_page_content(names: list[str] | None = None) -> list[str]:
+    """
+    Re-read loaded page content files from disk (all of them by default).
+
+    Files that fail to parse keep their previous content so a bad edit can't
+    blank a live page.
+
+    Returns:
+        Names of the pages whose content changed
+    """
+    global _content_version
+    changed = []
+    for name in names if names is not None else list(_page_content):
+        _page_mtimes[name] = _file_mtime(name)
+        content = _read_page_content(name)
+        if content is None:
+            continue
+        old_content = _page_content.get(name, {})
+        if content == old_content:
+            continue
+        _page_content[name] = content
+        changed.append(name)
+        for listener in _change_listeners:
+            try:
+                listener(name, old_content, content)
+            except Exception as e:
+                logger.exception(f"Page content change listener failed for {name}: {e}")
+
+    if changed:
+        _content_version += 1
+        logger.info(f"Page content reloaded: {', '.join(changed)} (version {_content_version})")
+    return changed
+
+
+def refresh_page_content() -> list[str]:
+    """Reload only the loaded pages whose files changed on disk since they were read."""
+    stale = [name for name in _page_content if _file_mtime(name) != _page_mtimes.get(name)]
+    return reload_page_content(stale) if stale else []
+
+
+def on_content_change(listener: Callable[[str, dict[str, Any], dict[str, Any]], None]) -> None:
+    """Register a callback run with (name, old, new) for every page whose content a reload changes."""
+    _change_listeners.append(listener)
+
+
+def content_version() -> int:
+    """Counter bumped every time a reload changes at least one page."""
+    return _content_version
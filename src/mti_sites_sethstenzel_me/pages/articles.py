@@ -1,21 +1,29 @@
 from nicegui import ui
 from mti_sites_sethstenzel_me.utils import load_css, import_web_fonts
 from mti_sites_sethstenzel_me.pages.templates.constants import *
-from mti_sites_sethstenzel_me.pages.templates.header import generate_header
-from mti_sites_sethstenzel_me.pages.templates.footer import generate_footer
-from mti_sites_sethstenzel_me.pages.templates.center_card import generate_center_card
+from mti_sites_sethstenzel_me.pages.templates.site_layout import site_content, build_site_layout
+from mti_sites_sethstenzel_me.static_render import static_page
+from mti_sites_sethstenzel_me.request_profiler import profiled
+from mti_sites_sethstenzel_me.route_cache import cacheable
 
 page_url = '/articles'
 
+@site_content(page_url)
+def articles_content():
+    with ui.row().classes("card-inner-row card-inner-row-content"):
+        ui.label('UPPER CONTENT')
+    with ui.row().classes("card-inner-row-footer"):
+        ui.label(FOOTER_TAGLINE)
+
+
+@cacheable(page_url, ttl=3600)
 @ui.page(page_url)
+@profiled(f'page {page_url}')
 def build_articles_page():
-    ui.add_head_html(import_web_fonts())
-    ui.add_head_html('<link rel="stylesheet" href="/static/css/styles.css">')
-    
-    def main_conent():
-        with ui.row().classes("card-inner-row card-inner-row-content"):
-            ui.label('UPPER CONTENT')
-        with ui.row().classes("card-inner-row-footer"):
-            ui.label('In search of the fantastic, hidden in the everyday.')
+    build_site_layout()
+
 
-    generate_center_card(generate_header, main_conent, generate_footer, url=page_url)
\ No newline at end of file
+@static_page(page_url, title=f'Articles | {SITE_NAME}', description='Articles by Seth Stenzel on software, hardware and technology.')
+def render_articles_static() -> str:
+    return """
+        <h2>Articles</h2>"""
\ No newline at end of file
@@ -1,50 +1,71 @@
-from loguru import logger
 from nicegui import ui
 from mti_sites_sethstenzel_me.utils import load_css, import_web_fonts
 from mti_sites_sethstenzel_me.pages.templates.constants import *
-from mti_sites_sethstenzel_me.pages.templates.nav_bar import nav_bar
-from mti_sites_sethstenzel_me.pages.templates.header import generate_header
-from mti_sites_sethstenzel_me.pages.templates.footer import generate_footer
-from mti_sites_sethstenzel_me.pages.templates.center_card import generate_center_card
-import json
+from mti_sites_sethstenzel_me.pages.templates.site_layout import site_content, build_site_layout
+from mti_sites_sethstenzel_me.page_content import get_page_content
+from mti_sites_sethstenzel_me.static_render import static_page
+from mti_sites_sethstenzel_me.request_profiler import profiled
+from mti_sites_sethstenzel_me.route_cache import cacheable
+from mti_sites_sethstenzel_me.content_push import live_content
+from html import escape
 
 page_url = '/'
-page_content = {}
-try:
-    with open('./content/pages/index.json', 'r') as json_file:
-            page_content = json.load(json_file)
-except FileNotFoundError:
-    logger.error("Index page content file not found: ./content/pages/index.json")
 
-@ui.page(page_url)
-def build_index_page():
-    ui.add_head_html(import_web_fonts())
-    ui.add_head_html('<link rel="stylesheet" href="/static/css/styles.css">')
-    
-    def main_conent():
-        with ui.row().classes("card-inner-row card-inner-row-content"):
-            with ui.grid(columns=2):
-                with ui.column().classes("left-main-content"):
-                    ui.label(page_content.get("left-content-text-1","?"))
-                    ui.html("<br>", sanitize=False)
-                    ui.label(page_content.get("left-content-text-2","?"))
-                with ui.column().classes("right-main-content").style("justify-content: right;"):
-                    with ui.grid(columns=2, rows=2):
-                        right_content: dict = page_content.get("right-content",{})
-                        if len(right_content.keys()):
-                            with ui.label().classes("stat-card"):
-                                ui.html(f"<span class='stat-card-large-text'>{right_content.get("tile-1",["",""])[0]}</span><span class='stat-card-small-text'>{right_content.get("tile-1",["",""])[1]}</span>", sanitize=False).classes("stat-card-blue")
-                            with ui.label().classes("stat-card"):
-                                ui.html(f"<span class='stat-card-large-text'>{right_content.get("tile-2",["",""])[0]}</span><span class='stat-card-small-text'>{right_content.get("tile-2",["",""])[1]}</span>", sanitize=False).classes("stat-card-white")
-                            with ui.label().classes("stat-card"):
-                                ui.html(f"<span class='stat-card-large-text'>{right_content.get("tile-3",["",""])[0]}</span><span class='stat-card-small-text'>{right_content.get("tile-3",["",""])[1]}</span>", sanitize=False).classes("stat-card-blue")
+def stat_card_html(tile: list | None) -> str:
+    large, small = (tile or ["", ""])[:2]
+    return f"<span class='stat-card-large-text'>{large}</span><span class='stat-card-small-text'>{small}</span>"
+
+
+@site_content(page_url)
+def index_content():
+    page_content = get_page_content('index')
+    with ui.row().classes("card-inner-row card-inner-row-content"):
+        with ui.grid(columns=2):
+            with ui.column().classes("left-main-content"):
+                for i, key in enumerate(("left-content-text-1", "left-content-text-2")):
+                    if i:
+                        ui.html("<br>", sanitize=False)
+                    text_label = ui.label(page_content.get(key, "?"))
+                    # Edits to index.json are pushed to open pages (see content_push)
+                    live_content(text_label, 'index', key, lambda label, text: label.set_text(text or "?"))
+            with ui.column().classes("right-main-content").style("justify-content: right;"):
+                with ui.grid(columns=2, rows=2):
+                    right_content: dict = page_content.get("right-content",{})
+                    if len(right_content.keys()):
+                        for i, color in enumerate(("stat-card-blue", "stat-card-white", "stat-card-blue", "stat-card-white"), start=1):
                             with ui.label().classes("stat-card"):
-                                ui.html(f"<span class='stat-card-large-text'>{right_content.get("tile-4",["",""])[0]}</span><span class='stat-card-small-text'>{right_content.get("tile-4",["",""])[1]}</span>", sanitize=False).classes("stat-card-white")
-        ui.html("<hr>", sanitize=False).classes("sectioning-hr")
-        with ui.row().classes("card-inner-row-footer"):
-            ui.label('In search of the fantastic, hidden in the everyday.')
+                                tile = ui.html(stat_card_html(right_content.get(f"tile-{i}")), sanitize=False).classes(color)
+                            live_content(tile, 'index', ("right-content", f"tile-{i}"), lambda html, value: html.set_content(stat_card_html(value)))
+    ui.html("<hr>", sanitize=False).classes("sectioning-hr")
+    with ui.row().classes("card-inner-row-footer"):
+        ui.label(FOOTER_TAGLINE)
 
-    generate_center_card(generate_header, main_conent, generate_footer, url=page_url)
 
+@cacheable(page_url, ttl=300, content=['index'])
+@ui.page(page_url)
+@profiled(f'page {page_url}')
+def build_index_page():
+    build_site_layout()
 
 
+@static_page(
+    page_url,
+    title=SITE_NAME,
+    description='Technology enthusiast with projects spanning software, hardware and many IT sectors.'
+)
+def render_index_static() -> str:
+    page_content = get_page_content('index')
+    right_content: dict = page_content.get("right-content", {})
+    # Tile text is trusted HTML (it may contain entities), same as on the live page
+    tiles = ''.join(
+        f"<li><strong>{tile[0]}</strong> {tile[1]}</li>"
+        for tile in (right_content.get(f"tile-{i}", ["", ""]) for i in range(1, 5))
+    )
+    return f"""
+        <section>
+            <p>{escape(page_content.get("left-content-text-1", ""))}</p>
+            <p>{escape(page_content.get("left-content-text-2", ""))}</p>
+        </section>
+        <section>
+            <ul>{tiles}</ul>
+        </section>"""
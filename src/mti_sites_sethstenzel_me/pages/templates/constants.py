@@ -1 +1,6 @@
-DARK_BLUE = '#1d6096'
\ No newline at end of file
+DARK_BLUE = '#1d6096'
+
+SITE_ORIGIN = 'https://sethstenzel.me'
+SITE_NAME = 'Seth Stenzel'
+SITE_TAGLINE = 'A little software, a little hardware, and a little of me :)'
+FOOTER_TAGLINE = 'In search of the fantastic, hidden in the everyday.'
\ No newline at end of file
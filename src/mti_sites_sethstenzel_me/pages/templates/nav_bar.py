@@ -1,8 +1,17 @@
 from nicegui import ui
 import base64
 
+# Internal pages linked from the nav bar, as (label, path)
+NAV_PAGES = [
+    ('Home', '/'),
+    ('Portfolio', '/portfolio'),
+    ('Articles', '/articles'),
+    ('Contact', '/contact'),
+]
 
 def nav_bar(active_page='') -> None:
+    page_links: dict[str, ui.link] = {}
+
     def link(label: str, path: str, icon_path:str = '', new_tab:bool=False, encode_icon=False):
         is_active = bool(active_page == path)
         base = 'no-underline hover:underline cursor-pointer'
@@ -31,12 +40,21 @@ def nav_bar(active_page='') -> None:
             with ui.link(target=path, new_tab=new_tab):
                 ui.image(f'{icon_path}').props(f'no-spinner no-transition loading="eager" fetchpriority="high" alt="{label.lower()}"').classes('nav-bar-icon')
         else:
-            ui.link(label, path).classes(base + (active if is_active else ''))
+            page_links[path] = ui.link(label, path).classes(base + (active if is_active else ''))
+
+    def update_active_link(path: str) -> None:
+        # In-app navigation keeps this nav bar, so move the highlight ourselves
+        path = path.split('?')[0].split('#')[0] or '/'
+        for link_path, page_link in page_links.items():
+            if link_path == path:
+                page_link.classes(add='active-page-link')
+            else:
+                page_link.classes(remove='active-page-link')
 
     with ui.row().classes('nav-bar-links w-full text-black px-4 py-2 gap-3 items-center'):
-        link('Home', '/')
-        link('Portfolio', '/portfolio')
-        link('Articles', '/articles')
-        link('Contact', '/contact')
+        for label, path in NAV_PAGES:
+            link(label, path)
         link('GitHub', 'https://github.com/sethstenzel', icon_path='/static/imgs/gh.png', new_tab=True)
-        link('YouTube', 'https://www.youtube.com/@sethstenzel', icon_path='/static/imgs/yt.svg', new_tab=True, encode_icon=False)
\ No newline at end of file
+        link('YouTube', 'https://www.youtube.com/@sethstenzel', icon_path='/static/imgs/yt.svg', new_tab=True, encode_icon=False)
+
+    ui.context.client.sub_pages_router.on_path_changed(update_active_link)
\ No newline at end of file
@@ -0,0 +1,40 @@
+from typing import Callable
+from nicegui import ui
+from mti_sites_sethstenzel_me.utils import import_web_fonts
+from mti_sites_sethstenzel_me.request_profiler import profiled
+from mti_sites_sethstenzel_me.pages.templates.header import generate_header
+from mti_sites_sethstenzel_me.pages.templates.footer import generate_footer
+from mti_sites_sethstenzel_me.pages.templates.center_card import generate_center_card
+
+# Main content builders for every site page, keyed by path. All pages share one
+# layout; navigating between them only swaps the main content region.
+SITE_CONTENT: dict[str, Callable[[], None]] = {}
+
+
+def site_content(path: str):
+    """Register the main content builder for a site page."""
+    def decorator(builder: Callable[[], None]) -> Callable[[], None]:
+        # In-app navigation runs only this builder, so profile it on its own
+        SITE_CONTENT[path] = profiled(f'content {path}')(builder)
+        return builder
+    return decorator
+
+
+def build_site_layout() -> None:
+    """
+    Build the shared page layout around a client-side routed content region.
+
+    Whichever site URL is loaded first, the visitor keeps this one client:
+    internal links are handled by ui.sub_pages, which rebuilds only the main
+    content and updates the URL and history.
+    """
+    ui.add_head_html(import_web_fonts())
+    ui.add_head_html('<link rel="stylesheet" href="/static/css/styles.css">')
+
+    current_path = ui.context.client.sub_pages_router.current_path.split('?')[0]
+    generate_center_card(
+        generate_header,
+        lambda: ui.sub_pages(SITE_CONTENT).classes('w-full items-center'),
+        generate_footer,
+        url=current_path
+    )
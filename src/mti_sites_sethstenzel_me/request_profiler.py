@@ -0,0 +1,148 @@
+import cProfile
+import functools
+import heapq
+import inspect
+import itertools
+import marshal
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+from loguru import logger
+
+# Opt-in sampling profiler for page builders and UI handlers. Disabled unless
+# SITE_PROFILE=1 or the site is started with --profile-requests.
+PROFILE_SAMPLE_RATE = float(os.environ.get('SITE_PROFILE_SAMPLE_RATE', '0.1'))
+PROFILE_SLOW_MS = float(os.environ.get('SITE_PROFILE_SLOW_MS', '100'))
+PROFILE_KEEP = int(os.environ.get('SITE_PROFILE_KEEP', '20'))
+
+_enabled = os.environ.get('SITE_PROFILE', '0').lower() in ('1', 'true', 'yes', 'on')
+# cProfile can't nest, and an inner builder is already covered by the outer profile
+_profiling = False
+_ids = itertools.count(1)
+
+
+@dataclass(order=True)
+class ProfileRecord:
+    duration: float
+    id: int = field(compare=False)
+    name: str = field(compare=False)
+    timestamp: float = field(compare=False)
+    stats: bytes = field(compare=False, repr=False)
+
+    def summary(self) -> dict:
+        return {
+            'id': self.id,
+            'name': self.name,
+            'duration_ms': round(self.duration * 1000, 3),
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.timestamp)),
+            'download': f'/_control/profiles/{self.id}.pstats',
+        }
+
+
+# Min-heap on duration, so the fastest of the kept profiles is evicted first
+_worst: list[ProfileRecord] = []
+
+
+def enable(sample_rate: float | None = None) -> None:
+    global _enabled, PROFILE_SAMPLE_RATE
+    _enabled = True
+    if sample_rate is not None:
+        PROFILE_SAMPLE_RATE = sample_rate
+    logger.info(
+        f"Request profiling enabled (sample rate {PROFILE_SAMPLE_RATE:g}, "
+        f"slow >= {PROFILE_SLOW_MS:g} ms, keeping worst {PROFILE_KEEP})"
+    )
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def _should_profile() -> bool:
+    return _enabled and not _profiling and random.random() < PROFILE_SAMPLE_RATE
+
+
+def _start() -> cProfile.Profile | None:
+    global _profiling
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another profiler (e.g. an attached debugger) is already active
+        return None
+    _profiling = True
+    return profiler
+
+
+def _finish(profiler: cProfile.Profile, name: str, started: float) -> None:
+    global _profiling
+    profiler.disable()
+    _profiling = False
+    duration = time.perf_counter() - started
+    if duration * 1000 < PROFILE_SLOW_MS:
+        return
+
+    profiler.create_stats()
+    record = ProfileRecord(duration, next(_ids), name, time.time(), marshal.dumps(profiler.stats))
+    if len(_worst) < PROFILE_KEEP:
+        heapq.heappush(_worst, record)
+    elif record.duration > _worst[0].duration:
+        heapq.heapreplace(_worst, record)
+    else:
+        return
+    logger.info(f"Slow {name} profiled: {duration * 1000:.1f} ms (profile {record.id})")
+
+
+def profiled(name: str) -> Callable:
+    """
+    Profile a sampled fraction of calls to a page builder or UI handler.
+
+    Calls slower than SITE_PROFILE_SLOW_MS keep their cProfile stats. Only the
+    worst SITE_PROFILE_KEEP are held. For async handlers the profile covers
+    everything the event loop runs until the handler finishes.
+    """
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                profiler = _start() if _should_profile() else None
+                if profiler is None:
+                    return await func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    _finish(profiler, name, started)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _start() if _should_profile() else None
+            if profiler is None:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _finish(profiler, name, started)
+        return wrapper
+    return decorator
+
+
+def worst_profiles() -> list[dict]:
+    """Summaries of the kept profiles, slowest first."""
+    return [record.summary() for record in sorted(_worst, reverse=True)]
+
+
+def profile_stats(profile_id: int) -> bytes | None:
+    """Marshalled pstats data for a kept profile (loadable with pstats.Stats, snakeviz, flameprof...)."""
+    for record in _worst:
+        if record.id == profile_id:
+            return record.stats
+    return None
+
+
+if _enabled:
+    enable()
@@ -0,0 +1,147 @@
+"""
+Cacheability metadata for site routes
+Pages declare here how long their plain-HTML rendering may be cached and which
+page content files it is built from. The app turns that into Cache-Control /
+ETag headers, and `python -m mti_sites_sethstenzel_me.route_cache` turns it
+into matching nginx proxy_cache configuration.
+"""
+
+import argparse
+import hashlib
+from dataclasses import dataclass, field
+from fastapi import Request
+
+# Live NiceGUI pages embed a per-visitor client id, so only the plain-HTML
+# rendering of a route (crawlers, ?static=1) is ever shared between visitors
+LIVE_PAGE_CACHE_CONTROL = 'private, no-store'
+
+
+@dataclass
+class CachePolicy:
+    path: str
+    ttl: int  # seconds
+    # Page content JSON files (by name) the page is built from
+    content: list[str] = field(default_factory=list)
+
+    @property
+    def cache_control(self) -> str:
+        return f'public, max-age={self.ttl}'
+
+
+CACHEABLE_ROUTES: dict[str, CachePolicy] = {}
+
+
+def cacheable(path: str, ttl: int, content: list[str] | None = None):
+    """
+    Declare a @ui.page route cacheable for `ttl` seconds.
+
+    `content` names the page content files the page depends on; they are
+    loaded before rendering so edits to them invalidate the rendered page.
+    """
+    def decorator(func):
+        CACHEABLE_ROUTES[path] = CachePolicy(path, ttl, content or [])
+        return func
+    return decorator
+
+
+def route_content(path: str) -> list[str]:
+    """Names of the content files a route depends on."""
+    policy = CACHEABLE_ROUTES.get(path)
+    return policy.content if policy else []
+
+
+def etag_for(body: str) -> str:
+    """Strong ETag derived from the response body, stable across restarts."""
+    return f'"{hashlib.blake2b(body.encode("utf-8"), digest_size=12).hexdigest()}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match already covers `etag`."""
+    if_none_match = request.headers.get('if-none-match')
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    return '*' in tags or etag in tags
+
+
+def nginx_http_config(zone: str, cache_dir: str) -> str:
+    """proxy_cache_path and the maps deciding which requests may use the cache (http level)."""
+    from mti_sites_sethstenzel_me.static_render import CRAWLER_USER_AGENTS
+
+    return f'''# Generated by `python -m mti_sites_sethstenzel_me.route_cache http` - do not edit by hand
+# Belongs at http level, e.g. /etc/nginx/conf.d/{zone}.conf
+
+proxy_cache_path {cache_dir} levels=1:2 keys_zone={zone}:10m max_size=100m inactive=1d use_temp_path=off;
+
+# Same user agents the app serves plain HTML to (static_render.CRAWLER_USER_AGENTS)
+map $http_user_agent ${zone}_crawler {{
+    default 0;
+    "~*{CRAWLER_USER_AGENTS.pattern}" 1;
+}}
+
+map $arg_static ${zone}_static_arg {{
+    default 0;
+    1 1;
+}}
+
+# 1 for requests that get a live NiceGUI page, which must never be cached.
+# The app also marks those responses no-store, in case this and it disagree.
+map "${zone}_static_arg${zone}_crawler" ${zone}_live_page {{
+    default 0;
+    00 1;
+}}
+'''
+
+
+def nginx_locations_config(zone: str, upstream: str) -> str:
+    """One exact-match location per cacheable route (server level)."""
+    blocks = [
+        f'# Generated by `python -m mti_sites_sethstenzel_me.route_cache locations` - do not edit by hand\n'
+        f'# Include inside the server block, before the main "location / {{" block'
+    ]
+    for path, policy in sorted(CACHEABLE_ROUTES.items()):
+        blocks.append(f'''location = {path} {{
+    proxy_pass {upstream};
+    proxy_http_version 1.1;
+
+    # Standard proxy headers
+    proxy_set_header Host $host;
+    proxy_set_header X-Real-IP $remote_addr;
+    proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
+    proxy_set_header X-Forwarded-Proto $scheme;
+
+    # Plain-HTML rendering only; live pages go straight through
+    proxy_buffering on;
+    proxy_cache {zone};
+    proxy_cache_key "$scheme$host$uri";
+    proxy_cache_valid 200 {policy.ttl}s;
+    proxy_cache_revalidate on;
+    proxy_cache_lock on;
+    proxy_cache_use_stale error timeout updating;
+    proxy_cache_bypass ${zone}_live_page;
+    proxy_no_cache ${zone}_live_page;
+    # Crawler and ?static=1 requests get the same document
+    proxy_ignore_headers Vary;
+    add_header X-Proxy-Cache $upstream_cache_status always;
+}}''')
+    return '\n\n'.join(blocks) + '\n'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate nginx proxy_cache configuration for cacheable routes')
+    parser.add_argument('part', choices=['http', 'locations'], help='http-level cache/map config, or server-level locations')
+    parser.add_argument('--zone', default='sethstenzel_pages', help='Cache zone name (default: sethstenzel_pages)')
+    parser.add_argument('--cache-dir', default='/var/cache/nginx/sethstenzel_pages', help='proxy_cache_path directory')
+    parser.add_argument('--upstream', default='http://127.0.0.1:18001', help='Site address (default: http://127.0.0.1:18001)')
+    args = parser.parse_args()
+
+    # Run as a script this module is __main__; the pages register their cache
+    # policies with the importable copy
+    from mti_sites_sethstenzel_me import route_cache
+
+    if args.part == 'http':
+        print(route_cache.nginx_http_config(args.zone, args.cache_dir), end='')
+    else:
+        from mti_sites_sethstenzel_me.routes import build_routes
+        build_routes()
+        print(route_cache.nginx_locations_config(args.zone, args.upstream), end='')
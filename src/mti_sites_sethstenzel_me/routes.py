@@ -6,3 +6,8 @@ def build_routes():
     from mti_sites_sethstenzel_me.pages.articles import build_articles_page
     from mti_sites_sethstenzel_me.pages.contact import build_contact_page
 
+    # Local-only control endpoints (content reload etc.), client admission
+    # control / idle reaping and live content pushes register the same way.
+    from mti_sites_sethstenzel_me import control
+    from mti_sites_sethstenzel_me import client_limits
+    from mti_sites_sethstenzel_me import content_push
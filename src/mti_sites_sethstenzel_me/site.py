@@ -1,3 +1,6 @@
+import time
+STARTUP_STARTED = time.perf_counter()
+
 import os
 import sys
 import argparse
@@ -32,8 +35,29 @@ if __name__ in {"__main__", "__mp_main__"}:
     parser = argparse.ArgumentParser(description='Run the sethstenzel.me site')
     parser.add_argument('--dev', action='store_true', help='Run in development mode')
     parser.add_argument('--prod', action='store_true', help='Run in production mode')
+    parser.add_argument('--profile-startup', action='store_true', help='Log an import time breakdown and time to first request')
+    parser.add_argument('--profile-requests', action='store_true', help='Profile a sample of page builds and keep the slowest (same as SITE_PROFILE=1)')
+    parser.add_argument('--profile-sample-rate', type=float, default=None, help='Fraction of page builds to profile; implies --profile-requests (default SITE_PROFILE_SAMPLE_RATE or 0.1)')
     args = parser.parse_args()
 
+    if args.profile_startup:
+        from nicegui import background_tasks, run
+        from mti_sites_sethstenzel_me.startup_profile import log_import_time_breakdown, track_time_to_first_request
+        track_time_to_first_request(app, STARTUP_STARTED)
+        # The breakdown replays startup in a child interpreter; run it once the
+        # server is up so it isn't counted in the readiness timings it reports
+        app.on_startup(lambda: background_tasks.create(run.io_bound(log_import_time_breakdown), name='import_time_breakdown'))
+
+    if args.profile_requests or args.profile_sample_rate is not None:
+        from mti_sites_sethstenzel_me import request_profiler
+        request_profiler.enable(args.profile_sample_rate)
+
+    # Warm the Gmail API imports off the event loop once the server is up, so
+    # neither startup nor the first contact form submission pays for them
+    from nicegui import background_tasks, run
+    from mti_sites_sethstenzel_me.utils import preload_gmail_api
+    app.on_startup(lambda: background_tasks.create(run.io_bound(preload_gmail_api), name='preload_gmail_api'))
+
     logger.info("Adding static file routes")
     app_root = Path(__file__).resolve().parent
     os.chdir(app_root)
@@ -73,11 +97,11 @@ if __name__ in {"__main__", "__mp_main__"}:
         logger.info(f"Port: 18001")
         logger.info(f"Auto-reload: Enabled")
         logger.info(f"Browser auto-open: Enabled")
-        logger.info(f"Watching: *.py, *.css, *.js, *.ts, *.json")
+        logger.info(f"Watching: *.py, *.css, *.js, *.ts (page content JSON is pushed live)")
 
         ui.run(
             port=18001,
             title='sethstenzel.me',
             favicon='🌐',
-            uvicorn_reload_includes="*.py, *.css, *.js, *.ts, *.json"
+            uvicorn_reload_includes="*.py, *.css, *.js, *.ts"
         )
\ No newline at end of file
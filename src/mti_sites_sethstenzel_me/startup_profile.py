@@ -0,0 +1,79 @@
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from loguru import logger
+
+# Imports replayed in a fresh interpreter to measure what loading the site costs
+PROFILED_STARTUP_CODE = (
+    'from mti_sites_sethstenzel_me.routes import build_routes; build_routes()'
+)
+
+
+def import_time_breakdown(limit: int = 15) -> list[tuple[str, float]]:
+    """
+    Measure import time of the site's startup path, grouped by top-level package.
+
+    Runs the imports in a child interpreter with `-X importtime` so the numbers
+    aren't skewed by anything this process already has loaded.
+
+    Returns:
+        List of (package, seconds), slowest first
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROFILED_STARTUP_CODE],
+        # The site chdirs into the package on startup; import it from its parent
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True,
+        text=True,
+        timeout=120
+    )
+
+    totals: dict[str, float] = defaultdict(float)
+    for line in result.stderr.splitlines():
+        # Format: "import time: <self us> | <cumulative us> | <indented module name>"
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        # Charge each module's own (self) time to its top-level package, so
+        # e.g. everything nicegui pulls in of its own shows up under 'nicegui'
+        package = parts[2].strip().split('.')[0]
+        totals[package] += int(parts[0]) / 1_000_000
+
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+def log_import_time_breakdown() -> None:
+    breakdown = import_time_breakdown()
+    if not breakdown:
+        logger.warning("Startup profile: no import timings captured")
+        return
+    total = sum(seconds for _, seconds in breakdown)
+    logger.info(f"Startup profile: import time breakdown (top {len(breakdown)}, {total:.3f}s)")
+    for package, seconds in breakdown:
+        logger.info(f"Startup profile:   {package:<30} {seconds * 1000:8.1f} ms")
+
+
+def track_time_to_first_request(app, started: float) -> None:
+    """Log when the server becomes ready and when it answers its first request."""
+    first_request_seen = False
+
+    def log_ready():
+        logger.info(f"Startup profile: server ready after {time.perf_counter() - started:.3f}s")
+
+    app.on_startup(log_ready)
+
+    @app.middleware('http')
+    async def log_first_request(request, call_next):
+        nonlocal first_request_seen
+        response = await call_next(request)
+        if not first_request_seen:
+            first_request_seen = True
+            logger.info(
+                f"Startup profile: first request ({request.url.path}) served "
+                f"after {time.perf_counter() - started:.3f}s"
+            )
+        return response
@@ -0,0 +1,153 @@
+import re
+from dataclasses import dataclass
+from html import escape
+from typing import Callable
+from fastapi import Request
+from fastapi.responses import HTMLResponse, Response
+from loguru import logger
+from nicegui import app
+from mti_sites_sethstenzel_me.page_content import get_page_content, refresh_page_content, content_version
+from mti_sites_sethstenzel_me.route_cache import CACHEABLE_ROUTES, LIVE_PAGE_CACHE_CONTROL, route_content, etag_for, is_not_modified
+from mti_sites_sethstenzel_me.pages.templates.constants import SITE_ORIGIN, SITE_NAME, SITE_TAGLINE, FOOTER_TAGLINE
+from mti_sites_sethstenzel_me.pages.templates.nav_bar import NAV_PAGES
+
+# Crawlers and link-preview fetchers that only need the page text, not a live
+# NiceGUI client (Vue runtime, websocket, element tree). Only whole product
+# tokens count: "Googlebot/2.1" and "Baiduspider/2.0" match, but a browser on
+# a Cubot phone must not. Also used verbatim as an nginx (PCRE) map pattern.
+CRAWLER_USER_AGENTS = re.compile(
+    r'\b[a-z]*(?:bot|spider|crawler)/|\b(?:bot|crawler|spider|slurp|preview)\b|'
+    r'\b(?:slackbot|telegrambot|facebookexternalhit|embedly|whatsapp|skypeuripreview|vkshare|pinterest)|'
+    r'quora link',
+    re.IGNORECASE
+)
+
+
+@dataclass
+class StaticPage:
+    path: str
+    title: str
+    description: str
+    render_main: Callable[[], str]
+
+
+STATIC_PAGES: dict[str, StaticPage] = {}
+# Rendered documents keyed by (route, content version); only the current
+# version is ever kept
+_render_cache: dict[tuple[str, int], str] = {}
+
+
+def static_page(path: str, title: str, description: str):
+    """
+    Register a plain-HTML renderer for a @ui.page route.
+
+    The decorated function returns the inner HTML of the page's <main>
+    element; the shared header, nav, footer and metadata are added here.
+    """
+    def decorator(render_main: Callable[[], str]) -> Callable[[], str]:
+        STATIC_PAGES[path] = StaticPage(path, title, description, render_main)
+        return render_main
+    return decorator
+
+
+def wants_static_render(request: Request) -> bool:
+    if request.query_params.get('static') == '1':
+        return True
+    return bool(CRAWLER_USER_AGENTS.search(request.headers.get('user-agent', '')))
+
+
+def render_document(page: StaticPage) -> str:
+    """Build the full semantic HTML document for a page."""
+    # Load the content the page depends on (declared with @cacheable) first so
+    # later edits to it are picked up by refresh_page_content()
+    for name in route_content(page.path):
+        get_page_content(name)
+
+    url = f'{SITE_ORIGIN}{page.path}'
+    title = escape(page.title)
+    description = escape(page.description)
+    nav_links = '\n'.join(
+        f'            <a href="{path}"{' aria-current="page"' if path == page.path else ''}>{escape(label)}</a>'
+        for label, path in NAV_PAGES
+    )
+    return f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <title>{title}</title>
+    <meta name="description" content="{description}">
+    <link rel="canonical" href="{url}">
+    <meta property="og:type" content="website">
+    <meta property="og:site_name" content="{escape(SITE_NAME)}">
+    <meta property="og:title" content="{title}">
+    <meta property="og:description" content="{description}">
+    <meta property="og:url" content="{url}">
+    <meta name="twitter:card" content="summary">
+    <meta name="twitter:title" content="{title}">
+    <meta name="twitter:description" content="{description}">
+    <link rel="stylesheet" href="/static/css/styles.css">
+</head>
+<body>
+    <header>
+        <h1>{escape(SITE_NAME)}</h1>
+        <p>{escape(SITE_TAGLINE)}</p>
+        <nav>
+{nav_links}
+        </nav>
+    </header>
+    <main>
+{page.render_main()}
+    </main>
+    <footer>
+        <p>{escape(FOOTER_TAGLINE)}</p>
+    </footer>
+</body>
+</html>
+'''
+
+
+def get_static_html(path: str) -> tuple[str, bool]:
+    """
+    Return the cached plain-HTML rendering of a route, rendering it if needed.
+
+    Returns:
+        Tuple of (html, whether it came from the cache)
+    """
+    # Picks up content JSON edited on disk; bumps the version if anything changed
+    refresh_page_content()
+
+    key = (path, content_version())
+    if key in _render_cache:
+        return _render_cache[key], True
+
+    if any(cached_version != key[1] for _, cached_version in _render_cache):
+        _render_cache.clear()
+    html = render_document(STATIC_PAGES[path])
+    _render_cache[key] = html
+    logger.debug(f"Rendered static HTML for {path} ({len(html)} bytes, content version {key[1]})")
+    return html, False
+
+
+@app.middleware('http')
+async def serve_static_render(request: Request, call_next):
+    """Serve cached plain HTML to crawlers and ?static=1 requests instead of a NiceGUI client."""
+    if request.method != 'GET' or request.url.path not in STATIC_PAGES:
+        return await call_next(request)
+    if not wants_static_render(request):
+        response = await call_next(request)
+        # The same URL serves different documents depending on the user agent
+        response.headers.append('Vary', 'User-Agent')
+        if request.url.path in CACHEABLE_ROUTES:
+            response.headers['Cache-Control'] = LIVE_PAGE_CACHE_CONTROL
+        return response
+
+    html, cached = get_static_html(request.url.path)
+    headers = {'X-Render-Cache': 'hit' if cached else 'miss', 'Vary': 'User-Agent'}
+    policy = CACHEABLE_ROUTES.get(request.url.path)
+    if policy:
+        etag = etag_for(html)
+        headers.update({'Cache-Control': policy.cache_control, 'ETag': etag})
+        if is_not_modified(request, etag):
+            return Response(status_code=304, headers=headers)
+    return HTMLResponse(html, headers=headers)
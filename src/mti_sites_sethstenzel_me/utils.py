@@ -1,20 +1,26 @@
 from pathlib import Path
 import os
 import base64
+import importlib.util
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from loguru import logger
 
-# Gmail API imports
-try:
-    from google.oauth2.credentials import Credentials
-    from google.auth.transport.requests import Request
-    from google_auth_oauthlib.flow import InstalledAppFlow
-    from googleapiclient.discovery import build
-    from googleapiclient.errors import HttpError
-    GMAIL_API_AVAILABLE = True
-except ImportError:
-    GMAIL_API_AVAILABLE = False
+def _module_available(name: str) -> bool:
+    """Check a module can be imported without actually importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ModuleNotFoundError:
+        return False
+
+
+# The Gmail API stack is slow to import and only needed when the contact form
+# is submitted, so only check it's installed here and import it on first use
+GMAIL_API_AVAILABLE = all(
+    _module_available(name)
+    for name in ('google.oauth2', 'google_auth_oauthlib', 'googleapiclient')
+)
+if not GMAIL_API_AVAILABLE:
     logger.warning("Gmail API libraries not available - contact form will not work")
 
 
@@ -45,6 +51,18 @@ def import_web_fonts() -> str:
 GMAIL_SCOPES = ['https://www.googleapis.com/auth/gmail.send']
 GMAIL_CREDENTIALS_FILE = os.getenv('GMAIL_CREDENTIALS_FILE', 'credentials.json')
 GMAIL_TOKEN_FILE = os.getenv('GMAIL_TOKEN_FILE', 'token.json')
+# Overrides https://gmail.googleapis.com/, e.g. to point at the benchmark's fake Gmail server
+GMAIL_API_ENDPOINT = os.getenv('GMAIL_API_ENDPOINT', '')
+
+def preload_gmail_api() -> None:
+    """Import the Gmail API stack ahead of the first contact form submission."""
+    if not GMAIL_API_AVAILABLE:
+        return
+    import googleapiclient.discovery
+    import google_auth_oauthlib.flow
+    import google.auth.transport.requests
+    logger.debug("Gmail API libraries preloaded")
+
 
 def get_gmail_service():
     """
@@ -57,6 +75,11 @@ def get_gmail_service():
         logger.error("Gmail API libraries not installed. Run: uv pip install -e .")
         return None
 
+    from google.oauth2.credentials import Credentials
+    from google.auth.transport.requests import Request
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from googleapiclient.discovery import build
+
     creds = None
     token_path = Path(GMAIL_TOKEN_FILE)
     credentials_path = Path(GMAIL_CREDENTIALS_FILE)
@@ -101,7 +124,8 @@ def get_gmail_service():
             logger.error(f"Error saving token: {e}")
 
     try:
-        service = build('gmail', 'v1', credentials=creds)
+        client_options = {'api_endpoint': GMAIL_API_ENDPOINT} if GMAIL_API_ENDPOINT else None
+        service = build('gmail', 'v1', credentials=creds, client_options=client_options)
         return service
     except Exception as e:
         logger.error(f"Error building Gmail service: {e}")
@@ -128,6 +152,12 @@ def send_email_via_gmail(
     Returns:
         Tuple of (success: bool, message: str)
     """
+    if not GMAIL_API_AVAILABLE:
+        logger.error("Gmail API libraries not installed. Run: uv pip install -e .")
+        return False, "Failed to authenticate with Gmail API"
+
+    from googleapiclient.errors import HttpError
+
     try:
         service = get_gmail_service()
         if not service:
@@ -0,0 +1,105 @@
+"""
+Change-aware deployment planning
+Looks at the files touched by a GitHub push and picks the cheapest
+deployment action that still brings the server fully up to date
+"""
+
+from dataclasses import dataclass, field
+from enum import IntEnum
+from fnmatch import fnmatch
+from typing import Dict, Any, List
+
+
+class DeployAction(IntEnum):
+    """Deployment actions, ordered from cheapest to most expensive."""
+    CONTENT = 1  # Pull, then reload page content JSON in the running site
+    STATIC = 2  # Pull only - static files and docs are served/read from disk
+    CODE = 3  # Pull and restart the site service
+    DEPENDENCIES = 4  # Full `deploy.sh update` (pull, reinstall, restart)
+
+
+# Files that decide what gets installed into the site's environment
+DEPENDENCY_FILES = ['pyproject.toml', 'uv.lock', 'requirements*.txt']
+
+# First matching pattern wins. Anything unmatched (deploy.sh, service files,
+# nginx configs, ...) falls through to a full update to stay on the safe side.
+CHANGE_RULES: List[tuple[str, DeployAction]] = [
+    *((pattern, DeployAction.DEPENDENCIES) for pattern in DEPENDENCY_FILES),
+    ('src/mti_sites_sethstenzel_me/content/pages/*.json', DeployAction.CONTENT),
+    ('src/mti_sites_sethstenzel_me/content/*', DeployAction.STATIC),
+    ('src/mti_sites_sethstenzel_me/static/*', DeployAction.STATIC),
+    ('*.md', DeployAction.STATIC),
+    ('src/*.py', DeployAction.CODE),
+]
+
+# GitHub only includes the first 20 commits of a push in the payload
+GITHUB_MAX_PAYLOAD_COMMITS = 20
+
+
+@dataclass
+class DeployPlan:
+    action: DeployAction
+    reason: str
+    files: List[str] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return self.action.name.lower()
+
+    @property
+    def dependency_change_only(self) -> bool:
+        """
+        True if a full update is needed only because dependency files changed.
+
+        False for the safety fallbacks (unknown files, forced pushes, missing or
+        truncated file lists), which need everything deploy.sh update does.
+        """
+        return self.action == DeployAction.DEPENDENCIES and bool(self.files) and all(
+            classify_path(path) < DeployAction.DEPENDENCIES or is_dependency_file(path)
+            for path in self.files
+        )
+
+
+def is_dependency_file(path: str) -> bool:
+    return any(fnmatch(path, pattern) for pattern in DEPENDENCY_FILES)
+
+
+def classify_path(path: str) -> DeployAction:
+    """Return the cheapest action that covers a change to a single file."""
+    for pattern, action in CHANGE_RULES:
+        if fnmatch(path, pattern):
+            return action
+    return DeployAction.DEPENDENCIES
+
+
+def changed_files(payload: Dict[str, Any]) -> List[str]:
+    """Collect every added, modified or removed path across the pushed commits."""
+    files: set[str] = set()
+    for commit in payload.get('commits', []):
+        for key in ('added', 'modified', 'removed'):
+            files.update(commit.get(key, []))
+    return sorted(files)
+
+
+def plan_deployment(payload: Dict[str, Any]) -> DeployPlan:
+    """Build a deployment plan from a GitHub push payload."""
+    commits = payload.get('commits', [])
+
+    # Without a complete file list we can't prove a cheaper action is enough
+    if payload.get('forced'):
+        return DeployPlan(DeployAction.DEPENDENCIES, 'forced push')
+    if not commits:
+        return DeployPlan(DeployAction.DEPENDENCIES, 'no commit file lists in payload')
+    if len(commits) >= GITHUB_MAX_PAYLOAD_COMMITS:
+        return DeployPlan(DeployAction.DEPENDENCIES, 'payload commit list may be truncated')
+
+    files = changed_files(payload)
+    if not files:
+        return DeployPlan(DeployAction.DEPENDENCIES, 'commits list no changed files')
+
+    action = max(classify_path(path) for path in files)
+    deciding = [path for path in files if classify_path(path) == action]
+    reason = f"{len(files)} changed file(s), highest impact: {', '.join(deciding[:3])}"
+    if len(deciding) > 3:
+        reason += f" (+{len(deciding) - 3} more)"
+    return DeployPlan(action, reason, files)
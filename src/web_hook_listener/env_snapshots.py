@@ -0,0 +1,309 @@
+"""
+Dependency-hash keyed virtualenv snapshots
+Each distinct dependency set gets its own prebuilt environment under the
+snapshot directory. Deployments switch the project's .venv symlink to the
+matching snapshot (building it only when the hash is new), and older
+snapshots are kept around for instant rollback.
+
+Usage:
+    python -m web_hook_listener.env_snapshots list
+    python -m web_hook_listener.env_snapshots rollback [HASH]
+"""
+
+import os
+import sys
+import re
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import tomllib
+import subprocess
+from pathlib import Path
+from typing import List
+
+from loguru import logger
+
+COMPLETE_MARKER = '.snapshot-complete'
+LOCK_FILES = ['uv.lock', 'requirements.txt']
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot can't be built or activated."""
+
+
+def base_python() -> str:
+    """
+    The real interpreter behind the running one.
+
+    The listener normally runs from the project's .venv, which may be a
+    snapshot symlink that is about to be switched; environments are built
+    from the interpreter it points at, never from a path through the link.
+    """
+    return os.path.realpath(getattr(sys, '_base_executable', sys.executable))
+
+
+def _canonical_name(name: str) -> str:
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+def resolve_dependencies(project_dir: Path, python: str = base_python()) -> List[str] | None:
+    """
+    Resolve the project's dependencies to exact `name==version` pins.
+
+    Uses `uv pip compile` when uv is installed, otherwise pip's resolver in
+    dry-run mode. Returns None if resolution fails (e.g. the index is
+    unreachable).
+    """
+    try:
+        if shutil.which('uv'):
+            result = subprocess.run(
+                ['uv', 'pip', 'compile', str(project_dir / 'pyproject.toml'), '--python', python,
+                 '--quiet', '--no-header', '--no-annotate'],
+                capture_output=True, text=True, timeout=300, check=True
+            )
+            pins = [line.strip() for line in result.stdout.splitlines() if line.strip() and not line.startswith('#')]
+        else:
+            # A virtualenv's interpreter resolves exactly like its base one, and
+            # unlike a distro's base interpreter it is sure to have pip
+            pip_python = sys.executable if os.path.realpath(python) == base_python() else python
+            result = subprocess.run(
+                [pip_python, '-m', 'pip', 'install', '--dry-run', '--quiet', '--ignore-installed', '--report', '-', str(project_dir)],
+                capture_output=True, text=True, timeout=300, check=True
+            )
+            with open(project_dir / 'pyproject.toml', 'rb') as f:
+                project_name = _canonical_name(tomllib.load(f).get('project', {}).get('name', ''))
+            pins = [
+                f"{_canonical_name(item['metadata']['name'])}=={item['metadata']['version']}"
+                for item in json.loads(result.stdout)['install']
+                # The project itself is installed editable, its version doesn't matter
+                if _canonical_name(item['metadata']['name']) != project_name
+            ]
+    except (OSError, subprocess.SubprocessError, ValueError, KeyError) as e:
+        logger.warning(f"Could not resolve dependencies: {e}")
+        return None
+    return sorted(pins, key=str.lower)
+
+
+def dependency_hash(project_dir: Path, python: str = base_python()) -> str:
+    """
+    Hash everything that decides what ends up installed in the environment.
+
+    That is the resolved dependency set (so new upstream releases get a new
+    snapshot) plus any lock file and the interpreter version. If resolution
+    fails, the normalized declarations from pyproject.toml are hashed instead.
+    """
+    digest = hashlib.sha256()
+
+    resolved = resolve_dependencies(project_dir, python)
+    if resolved is not None:
+        digest.update('\n'.join(resolved).encode())
+    else:
+        logger.warning("Hashing declared dependency specifiers only; the snapshot may be reused for a changed resolution")
+        with open(project_dir / 'pyproject.toml', 'rb') as f:
+            project = tomllib.load(f).get('project', {})
+        declared = {
+            'requires-python': project.get('requires-python', ''),
+            'dependencies': sorted(dep.replace(' ', '').lower() for dep in project.get('dependencies', [])),
+            'optional-dependencies': {
+                extra: sorted(dep.replace(' ', '').lower() for dep in deps)
+                for extra, deps in sorted(project.get('optional-dependencies', {}).items())
+            },
+        }
+        digest.update(json.dumps(declared, sort_keys=True).encode())
+
+    for lock_name in LOCK_FILES:
+        lock_path = project_dir / lock_name
+        if lock_path.exists():
+            digest.update(lock_name.encode())
+            digest.update(lock_path.read_bytes())
+
+    python_version = subprocess.run(
+        [python, '-c', 'import sys; print(sys.version)'],
+        capture_output=True, text=True, check=True
+    ).stdout.strip()
+    digest.update(python_version.encode())
+
+    return digest.hexdigest()[:16]
+
+
+def _run(command: List[str], cwd: Path | None = None) -> None:
+    logger.info(f"Running: {' '.join(command)}")
+    result = subprocess.run(command, cwd=cwd, capture_output=True, text=True, timeout=900)
+    if result.returncode != 0:
+        raise SnapshotError(f"{' '.join(command)} failed ({result.returncode}): {result.stderr}")
+
+
+def list_snapshots(snapshot_root: Path) -> List[Path]:
+    """Completed snapshots, newest first."""
+    if not snapshot_root.exists():
+        return []
+    snapshots = [p for p in snapshot_root.iterdir() if (p / COMPLETE_MARKER).exists()]
+    return sorted(snapshots, key=lambda p: (p / COMPLETE_MARKER).stat().st_mtime, reverse=True)
+
+
+def build_snapshot(project_dir: Path, snapshot_dir: Path, python: str = base_python()) -> None:
+    """Create a virtualenv at snapshot_dir and install the project into it."""
+    # Virtualenvs aren't relocatable, so build in place and only mark it
+    # complete once the install has fully succeeded
+    if snapshot_dir.exists():
+        logger.warning(f"Removing incomplete snapshot: {snapshot_dir}")
+        shutil.rmtree(snapshot_dir)
+
+    started = time.perf_counter()
+    snapshot_python = snapshot_dir / 'bin' / 'python'
+    try:
+        if shutil.which('uv'):
+            _run(['uv', 'venv', '--python', python, str(snapshot_dir)])
+            _run(['uv', 'pip', 'install', '--python', str(snapshot_python), '-e', str(project_dir)])
+        else:
+            _run([python, '-m', 'venv', str(snapshot_dir)])
+            _run([str(snapshot_python), '-m', 'pip', 'install', '-e', str(project_dir)])
+    except Exception:
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+        raise
+
+    (snapshot_dir / COMPLETE_MARKER).write_text(time.strftime('%Y-%m-%d %H:%M:%S'))
+    logger.info(f"Built environment snapshot {snapshot_dir.name} in {time.perf_counter() - started:.1f}s")
+
+
+def _replace_link(venv_link: Path, target: Path) -> None:
+    """Atomically point the venv_link symlink at target; it never goes missing."""
+    temp_link = venv_link.with_name(f'{venv_link.name}.swap-{os.getpid()}')
+    if temp_link.is_symlink() or temp_link.exists():
+        temp_link.unlink()
+    temp_link.symlink_to(target.resolve(), target_is_directory=True)
+    os.replace(temp_link, venv_link)
+
+
+def activate_snapshot(snapshot_dir: Path, venv_link: Path) -> None:
+    """Atomically point venv_link at snapshot_dir."""
+    if venv_link.exists() and not venv_link.is_symlink():
+        # First switch-over from a plain .venv directory; keep it for rollback by hand
+        legacy = venv_link.with_name(f'{venv_link.name}.pre-snapshot')
+        logger.warning(f"Moving existing environment {venv_link} to {legacy}")
+        venv_link.rename(legacy)
+
+    _replace_link(venv_link, snapshot_dir)
+    # Touch the marker so "newest" means most recently activated
+    (snapshot_dir / COMPLETE_MARKER).touch()
+    logger.info(f"Activated environment snapshot {snapshot_dir.name} at {venv_link}")
+
+
+def active_snapshot(venv_link: Path) -> Path | None:
+    if not venv_link.is_symlink():
+        return None
+    return venv_link.resolve()
+
+
+def deactivate_snapshot(venv_link: Path, python: str = base_python()) -> None:
+    """
+    Point venv_link back at the plain, non-snapshot environment.
+
+    Used before handing over to deploy.sh, which installs into .venv in place
+    and must never modify a snapshot that belongs to another dependency hash.
+    The plain environment is the .venv.pre-snapshot directory; if it is gone,
+    a fresh one is built next to it first. venv_link is only switched once
+    the environment exists, so .venv never goes missing.
+    """
+    if not venv_link.is_symlink():
+        return
+    plain = venv_link.with_name(f'{venv_link.name}.pre-snapshot')
+    if plain.is_dir() and venv_link.resolve() == plain.resolve():
+        return
+    # The interpreter may well live behind venv_link itself
+    python = os.path.realpath(python)
+
+    if not plain.is_dir():
+        build_dir = venv_link.with_name(f'{venv_link.name}.build-{os.getpid()}')
+        if build_dir.exists():
+            shutil.rmtree(build_dir)
+        try:
+            if shutil.which('uv'):
+                _run(['uv', 'venv', '--python', python, str(build_dir)])
+            else:
+                _run([python, '-m', 'venv', str(build_dir)])
+        except Exception:
+            shutil.rmtree(build_dir, ignore_errors=True)
+            raise
+        build_dir.rename(plain)
+        logger.info(f"Created a fresh plain environment at {plain}")
+
+    _replace_link(venv_link, plain)
+    logger.info(f"Deactivated environment snapshot, {venv_link} now points at {plain}")
+
+
+def prune_snapshots(snapshot_root: Path, keep: int, venv_link: Path) -> None:
+    """Delete all but the `keep` most recent snapshots, never the active one."""
+    active = active_snapshot(venv_link)
+    for snapshot in list_snapshots(snapshot_root)[max(keep, 1):]:
+        if active and snapshot.resolve() == active:
+            continue
+        logger.info(f"Pruning old environment snapshot {snapshot.name}")
+        shutil.rmtree(snapshot, ignore_errors=True)
+
+
+def ensure_environment(
+    project_dir: Path,
+    snapshot_root: Path,
+    venv_link: Path,
+    keep: int = 3,
+    python: str = base_python()
+) -> tuple[str, bool]:
+    """
+    Make venv_link point at an environment matching the project's dependencies.
+
+    Returns:
+        Tuple of (dependency hash, whether a new snapshot had to be built)
+    """
+    snapshot_root.mkdir(parents=True, exist_ok=True)
+    dep_hash = dependency_hash(project_dir, python)
+    snapshot_dir = snapshot_root / dep_hash
+
+    built = False
+    if (snapshot_dir / COMPLETE_MARKER).exists():
+        logger.info(f"Reusing environment snapshot {dep_hash}")
+    else:
+        logger.info(f"No environment snapshot for dependency hash {dep_hash}, building")
+        build_snapshot(project_dir, snapshot_dir, python)
+        built = True
+
+    if active_snapshot(venv_link) != snapshot_dir.resolve():
+        activate_snapshot(snapshot_dir, venv_link)
+    prune_snapshots(snapshot_root, keep, venv_link)
+    return dep_hash, built
+
+
+def rollback(snapshot_root: Path, venv_link: Path, target: str | None = None) -> Path:
+    """Switch to a specific snapshot, or to the most recent one that isn't active."""
+    active = active_snapshot(venv_link)
+    candidates = [p for p in list_snapshots(snapshot_root) if p.resolve() != active]
+    if target:
+        candidates = [p for p in candidates if p.name.startswith(target)]
+    if not candidates:
+        raise SnapshotError("No snapshot available to roll back to")
+    activate_snapshot(candidates[0], venv_link)
+    return candidates[0]
+
+
+if __name__ == '__main__':
+    deploy_dir = Path(os.environ.get('DEPLOY_DIR', '.')).resolve()
+    parser = argparse.ArgumentParser(description='Manage dependency-keyed environment snapshots')
+    parser.add_argument('command', choices=['list', 'rollback'])
+    parser.add_argument('hash', nargs='?', help='Snapshot hash (prefix) to roll back to')
+    parser.add_argument('--snapshot-dir', default=os.environ.get('ENV_SNAPSHOT_DIR', str(deploy_dir / '.venv-snapshots')))
+    parser.add_argument('--venv', default=os.environ.get('VENV_PATH', str(deploy_dir / '.venv')))
+    args = parser.parse_args()
+
+    snapshot_root = Path(args.snapshot_dir)
+    venv_link = Path(args.venv)
+
+    if args.command == 'list':
+        active = active_snapshot(venv_link)
+        for snapshot in list_snapshots(snapshot_root):
+            marker = '*' if snapshot.resolve() == active else ' '
+            print(f"{marker} {snapshot.name}  {(snapshot / COMPLETE_MARKER).read_text()}")
+    else:
+        snapshot = rollback(snapshot_root, venv_link, args.hash)
+        print(f"Rolled back to {snapshot.name} - restart the site service to use it")
@@ -9,14 +9,21 @@ import os
 import sys
 import hmac
 import hashlib
+import time
 import subprocess
+import urllib.request
+from pathlib import Path
 from typing import Dict, Any, List
 
 from fastapi import FastAPI, Request, HTTPException, Header, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
 from loguru import logger
 
+from web_hook_listener.deploy_planner import DeployAction, DeployPlan, plan_deployment
+from web_hook_listener.env_snapshots import base_python, ensure_environment, deactivate_snapshot
+from mti_common.loop_watchdog import LoopWatchdog
+
 # Configure loguru
 logger.remove()  # Remove default handler
 logger.add(
@@ -43,6 +50,21 @@ WEBHOOK_PORT = int(os.environ.get('WEBHOOK_PORT', '18100'))
 DEPLOY_SCRIPT = os.environ.get('DEPLOY_SCRIPT', './deploy.sh')
 SERVICE_NAME = os.environ.get('SERVICE_NAME', 'sethstenzel-site')
 ALLOWED_BRANCHES = os.environ.get('ALLOWED_BRANCHES', 'release').split(',')
+DEPLOY_DIR = os.environ.get('DEPLOY_DIR', str(Path(DEPLOY_SCRIPT).resolve().parent))
+SITE_CONTROL_URL = os.environ.get('SITE_CONTROL_URL', 'http://127.0.0.1:18001/_control')
+
+# Dependency-keyed environment snapshots (disabled unless ENV_SNAPSHOT_DIR is set)
+ENV_SNAPSHOT_DIR = os.environ.get('ENV_SNAPSHOT_DIR', '')
+ENV_SNAPSHOTS_KEEP = int(os.environ.get('ENV_SNAPSHOTS_KEEP', '3'))
+VENV_PATH = os.environ.get('VENV_PATH', str(Path(DEPLOY_DIR) / '.venv'))
+SNAPSHOT_PYTHON = os.environ.get('SNAPSHOT_PYTHON', base_python())
+
+# Seconds a full `deploy.sh update` takes; refreshed every time one runs so the
+# "time saved" figure logged for cheaper plans tracks reality
+full_deploy_seconds = float(os.environ.get('FULL_DEPLOY_ESTIMATE_SECONDS', '90'))
+
+# Event loop lag watchdog (LOOP_WATCHDOG=0 disables it)
+loop_watchdog = LoopWatchdog.from_env('webhook-listener')
 
 # FastAPI app
 app = FastAPI(
@@ -67,6 +89,7 @@ class WebhookResponse(BaseModel):
     branch: str | None = None
     pusher: str | None = None
     commits: int | None = None
+    plan: str | None = None
     output: str | None = None
 
 
@@ -74,6 +97,7 @@ class ErrorResponse(BaseModel):
     error: str
     repository: str | None = None
     branch: str | None = None
+    plan: str | None = None
     output: str | None = None
 
 
@@ -102,36 +126,147 @@ def verify_signature(payload_body: bytes, signature_header: str | None) -> bool:
         return False
 
 
-async def run_deployment() -> tuple[bool, str]:
-    """Execute the deployment script asynchronously."""
+def run_command(command: List[str], cwd: str | None = None) -> tuple[bool, str]:
+    """Run a single deployment step and return (success, output)."""
     try:
-        logger.info(f"Running deployment script: {DEPLOY_SCRIPT}")
-
-        # Run the deploy.sh update command
+        logger.info(f"Running: {' '.join(command)}")
         result = subprocess.run(
-            [DEPLOY_SCRIPT, 'update'],
+            command,
+            cwd=cwd,
             capture_output=True,
             text=True,
             timeout=300  # 5 minute timeout
         )
 
         if result.returncode == 0:
-            logger.info("Deployment successful!")
             logger.info(f"Output: {result.stdout}")
             return True, result.stdout
         else:
-            logger.error(f"Deployment failed with exit code {result.returncode}")
+            logger.error(f"Command failed with exit code {result.returncode}")
             logger.error(f"Error: {result.stderr}")
             return False, result.stderr
 
     except subprocess.TimeoutExpired:
-        logger.error("Deployment timed out!")
+        logger.error(f"Command timed out: {' '.join(command)}")
         return False, "Deployment timed out after 5 minutes"
     except Exception as e:
         logger.error(f"Deployment error: {str(e)}")
         return False, str(e)
 
 
+def pull_changes() -> tuple[bool, str]:
+    """Fast-forward the deployed checkout to the pushed commit."""
+    return run_command(['git', 'pull', '--ff-only'], cwd=DEPLOY_DIR)
+
+
+def reload_site_content() -> tuple[bool, str]:
+    """Ask the running site to re-read its page content JSON."""
+    url = f"{SITE_CONTROL_URL}/reload-content"
+    try:
+        logger.info(f"Requesting content reload: {url}")
+        request = urllib.request.Request(url, method='POST')
+        with urllib.request.urlopen(request, timeout=10) as response:
+            body = response.read().decode('utf-8')
+        logger.info(f"Content reload response: {body}")
+        return True, body
+    except Exception as e:
+        logger.error(f"Content reload failed: {str(e)}")
+        return False, str(e)
+
+
+def update_environment() -> tuple[bool, str, bool]:
+    """
+    Switch the site's virtualenv to the snapshot matching its dependencies.
+
+    Returns:
+        Tuple of (success, output, whether a new snapshot was built)
+    """
+    try:
+        dep_hash, built = ensure_environment(
+            project_dir=Path(DEPLOY_DIR),
+            snapshot_root=Path(ENV_SNAPSHOT_DIR),
+            venv_link=Path(VENV_PATH),
+            keep=ENV_SNAPSHOTS_KEEP,
+            python=SNAPSHOT_PYTHON
+        )
+        state = "built" if built else "reused"
+        return True, f"Environment snapshot {dep_hash} {state}\n", built
+    except Exception as e:
+        logger.error(f"Environment snapshot error: {str(e)}")
+        return False, str(e), False
+
+
+def run_full_update() -> tuple[bool, str]:
+    """Run `deploy.sh update`, making sure it can't install into a snapshot."""
+    if ENV_SNAPSHOT_DIR:
+        try:
+            deactivate_snapshot(Path(VENV_PATH), SNAPSHOT_PYTHON)
+        except Exception as e:
+            logger.error(f"Could not deactivate environment snapshot: {str(e)}")
+            return False, f"Could not deactivate environment snapshot: {e}"
+    logger.info(f"Running deployment script: {DEPLOY_SCRIPT}")
+    return run_command([DEPLOY_SCRIPT, 'update'])
+
+
+async def run_deployment(plan: DeployPlan) -> tuple[bool, str]:
+    """Execute the cheapest deployment steps that cover the planned changes."""
+    global full_deploy_seconds
+
+    logger.info(f"Deploy plan: {plan.name} ({plan.reason})")
+    started = time.perf_counter()
+
+    # Only runs that actually (re)installed dependencies say anything about
+    # how long a full update takes
+    full_install = plan.action == DeployAction.DEPENDENCIES
+
+    # Snapshots only cover dependency changes; the safety fallbacks (unknown
+    # files, forced pushes, truncated payloads) always get deploy.sh update
+    if ENV_SNAPSHOT_DIR and plan.dependency_change_only:
+        success, output = pull_changes()
+        if success:
+            success, env_output, full_install = update_environment()
+            output += env_output
+            if success:
+                success, restart_output = run_command([DEPLOY_SCRIPT, 'restart'])
+                output += restart_output
+        else:
+            # e.g. history rewritten without a forced-push flag
+            logger.warning("Pull failed, falling back to full deployment script")
+            success, output = run_full_update()
+    elif plan.action == DeployAction.DEPENDENCIES:
+        success, output = run_full_update()
+    else:
+        success, output = pull_changes()
+        if success and plan.action == DeployAction.CONTENT:
+            reloaded, reload_output = reload_site_content()
+            if reloaded:
+                output += reload_output
+            else:
+                # Site unreachable or too old to reload in-process - restart it
+                logger.warning("Falling back to a service restart")
+                success, restart_output = run_command([DEPLOY_SCRIPT, 'restart'])
+                output += restart_output
+        elif success and plan.action == DeployAction.CODE:
+            success, restart_output = run_command([DEPLOY_SCRIPT, 'restart'])
+            output += restart_output
+
+    elapsed = time.perf_counter() - started
+    if full_install:
+        if success:
+            full_deploy_seconds = elapsed
+        logger.info(f"Deploy plan {plan.name} finished in {elapsed:.1f}s (success: {success})")
+    else:
+        saved = max(0.0, full_deploy_seconds - elapsed)
+        logger.info(
+            f"Deploy plan {plan.name} finished in {elapsed:.1f}s (success: {success}), "
+            f"saved ~{saved:.1f}s vs full update"
+        )
+
+    if success:
+        logger.info("Deployment successful!")
+    return success, output
+
+
 @app.get("/", response_model=ServiceInfo)
 async def index():
     """Root endpoint - show service info."""
@@ -142,12 +277,14 @@ async def index():
             "/": "Service information",
             "/health": "Health check",
             "/webhook": "GitHub webhook endpoint (POST only)",
+            "/loop-lag": "Event loop lag histogram (?format=prometheus)",
             "/docs": "Interactive API documentation (Swagger UI)",
             "/redoc": "API documentation (ReDoc)"
         },
         configuration={
             "service_name": SERVICE_NAME,
             "allowed_branches": ALLOWED_BRANCHES,
+            "deploy_dir": DEPLOY_DIR,
             "port": WEBHOOK_PORT
         }
     )
@@ -163,6 +300,16 @@ async def health():
     )
 
 
+@app.get("/loop-lag")
+async def loop_lag(format: str = 'json'):
+    """Event loop lag histogram as JSON, or Prometheus text with ?format=prometheus."""
+    if not loop_watchdog:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Loop watchdog disabled")
+    if format == 'prometheus':
+        return PlainTextResponse(loop_watchdog.prometheus())
+    return loop_watchdog.snapshot()
+
+
 @app.post("/webhook")
 async def webhook(
     request: Request,
@@ -227,8 +374,9 @@ async def webhook(
 
     logger.info(f"Push to {repo_name}/{branch} by {pusher} ({commits_count} commits)")
 
-    # Trigger deployment
-    success, output = await run_deployment()
+    # Pick the cheapest deployment that covers the pushed changes
+    plan = plan_deployment(payload)
+    success, output = await run_deployment(plan)
 
     if success:
         return JSONResponse(
@@ -239,6 +387,7 @@ async def webhook(
                 branch=branch,
                 pusher=pusher,
                 commits=commits_count,
+                plan=plan.name,
                 output=output
             ).model_dump()
         )
@@ -249,6 +398,7 @@ async def webhook(
                 error="Deployment failed",
                 repository=repo_name,
                 branch=branch,
+                plan=plan.name,
                 output=output
             ).model_dump()
         )
@@ -261,14 +411,22 @@ async def startup_event():
     logger.info(f"Service: {SERVICE_NAME}")
     logger.info(f"Allowed branches: {ALLOWED_BRANCHES}")
     logger.info(f"Deploy script: {DEPLOY_SCRIPT}")
+    logger.info(f"Deploy directory: {DEPLOY_DIR}")
+    logger.info(f"Site control URL: {SITE_CONTROL_URL}")
+    if ENV_SNAPSHOT_DIR:
+        logger.info(f"Environment snapshots: {ENV_SNAPSHOT_DIR} (keeping {ENV_SNAPSHOTS_KEEP}, venv: {VENV_PATH})")
     logger.info(f"Port: {WEBHOOK_PORT}")
     logger.info(f"API Documentation available at: http://127.0.0.1:{WEBHOOK_PORT}/docs")
+    if loop_watchdog:
+        loop_watchdog.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Log shutdown information."""
     logger.info("Shutting down GitHub Webhook Listener")
+    if loop_watchdog:
+        loop_watchdog.stop()
 
 
 if __name__ == '__main__':
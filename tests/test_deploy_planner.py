@@ -0,0 +1,74 @@
+from web_hook_listener.deploy_planner import (
+    DeployAction,
+    GITHUB_MAX_PAYLOAD_COMMITS,
+    classify_path,
+    plan_deployment,
+)
+
+
+def push(*commits: list[str], **extra) -> dict:
+    """A push payload with one commit per list of modified files."""
+    return {
+        'commits': [{'added': [], 'modified': files, 'removed': []} for files in commits],
+        **extra,
+    }
+
+
+def test_classify_path():
+    assert classify_path('pyproject.toml') == DeployAction.DEPENDENCIES
+    assert classify_path('requirements-dev.txt') == DeployAction.DEPENDENCIES
+    assert classify_path('src/mti_sites_sethstenzel_me/content/pages/index.json') == DeployAction.CONTENT
+    assert classify_path('src/mti_sites_sethstenzel_me/content/images/me.png') == DeployAction.STATIC
+    assert classify_path('src/mti_sites_sethstenzel_me/static/css/styles.css') == DeployAction.STATIC
+    assert classify_path('README.md') == DeployAction.STATIC
+    assert classify_path('src/mti_sites_sethstenzel_me/site.py') == DeployAction.CODE
+
+
+def test_unknown_files_get_a_full_update():
+    for path in ('deploy.sh', 'webhook-listener.service', 'nginx-site-pre-cert.conf'):
+        assert classify_path(path) == DeployAction.DEPENDENCIES
+
+
+def test_content_only_push():
+    plan = plan_deployment(push(['src/mti_sites_sethstenzel_me/content/pages/index.json']))
+    assert plan.action == DeployAction.CONTENT
+    assert plan.files == ['src/mti_sites_sethstenzel_me/content/pages/index.json']
+
+
+def test_mixed_content_and_code_push_restarts():
+    plan = plan_deployment(push(
+        ['src/mti_sites_sethstenzel_me/content/pages/index.json'],
+        ['src/mti_sites_sethstenzel_me/pages/index.py'],
+    ))
+    assert plan.action == DeployAction.CODE
+    assert 'src/mti_sites_sethstenzel_me/pages/index.py' in plan.reason
+
+
+def test_removed_files_count():
+    plan = plan_deployment({'commits': [{'removed': ['pyproject.toml']}]})
+    assert plan.action == DeployAction.DEPENDENCIES
+
+
+def test_forced_push_gets_a_full_update():
+    plan = plan_deployment(push(['README.md'], forced=True))
+    assert plan.action == DeployAction.DEPENDENCIES
+    assert plan.reason == 'forced push'
+
+
+def test_truncated_payload_gets_a_full_update():
+    plan = plan_deployment(push(*[['README.md']] * GITHUB_MAX_PAYLOAD_COMMITS))
+    assert plan.action == DeployAction.DEPENDENCIES
+    assert plan.reason == 'payload commit list may be truncated'
+
+
+def test_empty_payloads_get_a_full_update():
+    assert plan_deployment({}).action == DeployAction.DEPENDENCIES
+    assert plan_deployment(push([])).action == DeployAction.DEPENDENCIES
+
+
+def test_dependency_change_only():
+    assert plan_deployment(push(['pyproject.toml'], ['src/mti_sites_sethstenzel_me/site.py'])).dependency_change_only
+    assert not plan_deployment(push(['pyproject.toml', 'deploy.sh'])).dependency_change_only
+    assert not plan_deployment(push(['pyproject.toml'], forced=True)).dependency_change_only
+    assert not plan_deployment({}).dependency_change_only
+    assert not plan_deployment(push(['src/mti_sites_sethstenzel_me/site.py'])).dependency_change_only
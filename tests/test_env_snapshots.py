@@ -0,0 +1,29 @@
+import pytest
+
+from web_hook_listener.env_snapshots import activate_snapshot, deactivate_snapshot
+
+
+@pytest.fixture
+def venv_link(tmp_path):
+    snapshot = tmp_path / 'snapshots' / 'abc123'
+    (snapshot / 'bin').mkdir(parents=True)
+    link = tmp_path / '.venv'
+    activate_snapshot(snapshot, link)
+    return link
+
+
+def test_deactivate_switches_to_plain_environment(venv_link):
+    plain = venv_link.with_name('.venv.pre-snapshot')
+    plain.mkdir()
+    deactivate_snapshot(venv_link, str(venv_link / 'bin' / 'python'))
+    assert venv_link.is_symlink()
+    assert venv_link.resolve() == plain.resolve()
+
+
+def test_failed_deactivate_keeps_the_snapshot_linked(venv_link, monkeypatch):
+    monkeypatch.setattr('shutil.which', lambda name: None)
+    snapshot = venv_link.resolve()
+    with pytest.raises(Exception):
+        deactivate_snapshot(venv_link, str(venv_link.parent / 'missing' / 'python'))
+    assert venv_link.resolve() == snapshot
+    assert sorted(p.name for p in venv_link.parent.iterdir()) == ['.venv', 'snapshots']